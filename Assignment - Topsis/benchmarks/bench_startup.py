@@ -0,0 +1,90 @@
+"""Start-up cost of the ``topsis`` console script.
+
+Run from the ``Assignment - Topsis`` directory:
+
+    python benchmarks/bench_startup.py
+
+Reports the import time of the entry-point module (``-X importtime``) and
+the wall time of a full run on ``sample_input.csv`` through the fast path
+and through the pandas path, and checks them against the budgets below.
+Exits with status 1 when a budget is exceeded.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, "sample_input.csv")
+
+# Budgets in milliseconds
+IMPORT_BUDGET_MS = 25.0
+FAST_RUN_BUDGET_MS = 150.0
+
+ENTRY = "import sys; from topsis_vansh_102303806.{module} import main; sys.argv[0] = 'topsis'; main()"
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def import_time_ms(module):
+    # Cumulative import time of the module, as reported by -X importtime
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_env(), check=True,
+    )
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def run_ms(module, output_file, repeat):
+    args = [sys.executable, "-c", ENTRY.format(module=module),
+            SAMPLE, "1,1,1,1", "+,+,+,+", output_file]
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, capture_output=True, env=_env(), check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        output_file = os.path.join(workdir, "output.csv")
+        report = [
+            ("import topsis_vansh_102303806.cli",
+             import_time_ms("topsis_vansh_102303806.cli"), IMPORT_BUDGET_MS),
+            ("import topsis_vansh_102303806.topsis",
+             import_time_ms("topsis_vansh_102303806.topsis"), None),
+            ("run sample_input.csv (fast path)",
+             run_ms("cli", output_file, args.repeat), FAST_RUN_BUDGET_MS),
+            ("run sample_input.csv (pandas path)",
+             run_ms("topsis", output_file, args.repeat), None),
+        ]
+
+    status = 0
+    for name, ms, budget in report:
+        verdict = ""
+        if budget is not None:
+            verdict = f"budget {budget:.0f} ms  " + ("ok" if ms <= budget else "OVER")
+            if ms > budget:
+                status = 1
+        print(f"{name:<40} {ms:8.1f} ms  {verdict}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""Stage-by-stage benchmark of the TOPSIS package on synthetic matrices.
+
+Run from the ``Assignment - Topsis`` directory:
+
+    python benchmarks/bench_topsis.py
+    python benchmarks/bench_topsis.py --rows 1000,1000000 --criteria 3,500
+    python benchmarks/bench_topsis.py --preset full --save-baseline
+
+Each case writes a synthetic decision matrix to a temporary directory and
+runs ``run_topsis`` on it, in memory (load, normalize, ideal, weight,
+distance, rank, write) and, for CSV input, with ``--chunksize``
+(statistics, score, rank, write). Stages are timed by ``StageProfiler``
+with memory measurement off; the peak resident memory of each stage comes
+from a second run, so it does not affect the timings. Results are printed
+and written as JSON; with a baseline file present, stages slower than the
+baseline by more than the tolerance are reported as regressions.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topsis_vansh_102303806.profiling import StageProfiler  # noqa: E402
+from topsis_vansh_102303806.topsis import run_topsis  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "baseline.json")
+
+PRESETS = {
+    "quick": ([10 ** 3, 10 ** 4, 10 ** 5], [3, 50]),
+    "default": ([10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], [3, 10, 50]),
+    "full": ([10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8], [3, 10, 100, 500]),
+}
+
+# Chunked mode reads and writes CSV only
+MODES = ["memory", "chunked"]
+
+
+def make_matrix(rows, criteria, dtype, seed=0):
+    rng = np.random.default_rng(seed)
+    if np.issubdtype(np.dtype(dtype), np.integer):
+        values = rng.integers(1, 1000, size=(rows, criteria)).astype(dtype)
+    else:
+        values = (rng.random((rows, criteria)) * 1000).astype(dtype)
+    data = pd.DataFrame(values, columns=[f"C{j + 1}" for j in range(criteria)])
+    data.insert(0, "Alternative", np.char.add("A", np.arange(rows).astype(str)))
+    return data
+
+
+def write_input(data, path):
+    if path.endswith(".npy"):
+        np.save(path, data.iloc[:, 1:].to_numpy())
+    elif path.endswith(".parquet"):
+        data.to_parquet(path, index=False)
+    else:
+        data.to_csv(path, index=False)
+
+
+def profile_run(run, memory):
+    # run_topsis reports success on stdout; keep the benchmark output readable
+    with StageProfiler(memory=memory) as profiler, contextlib.redirect_stdout(io.StringIO()):
+        run()
+    return profiler.records
+
+
+def run_case(rows, criteria, dtype, fmt, mode, chunksize, workdir):
+    data = make_matrix(rows, criteria, dtype)
+    input_file = os.path.join(workdir, f"input.{fmt}")
+    output_file = os.path.join(workdir, f"output.{fmt}")
+    write_input(data, input_file)
+    del data
+
+    weights = [1.0] * criteria
+    impacts = ["+" if j % 2 == 0 else "-" for j in range(criteria)]
+
+    def run():
+        run_topsis(input_file, weights, impacts, output_file,
+                   chunksize=chunksize if mode == "chunked" else None)
+
+    # Timed without measuring memory, then measured in a second run
+    timed = profile_run(run, memory=False)
+    measured = profile_run(run, memory=True)
+
+    stages = {}
+    for timing, memory in zip(timed, measured):
+        stages[timing["stage"]] = {
+            "seconds": timing["seconds"],
+            "rows_per_second": timing["rows_per_second"],
+            "peak_rss_bytes": memory["peak_rss_bytes"],
+        }
+
+    return {
+        "rows": rows,
+        "criteria": criteria,
+        "dtype": dtype,
+        "format": fmt,
+        "mode": mode,
+        "chunksize": chunksize if mode == "chunked" else None,
+        "stages": stages,
+        "total_seconds": sum(s["seconds"] for s in stages.values()),
+    }
+
+
+def case_key(case):
+    return f"{case['format']}/{case['mode']}/{case['dtype']}/{case['rows']}x{case['criteria']}"
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    old = {case_key(case): case for case in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        previous = old.get(case_key(case))
+        if previous is None:
+            continue
+        for stage, timing in case["stages"].items():
+            before = previous["stages"].get(stage, {}).get("seconds")
+            if (before and timing["seconds"] > before * tolerance
+                    and timing["seconds"] - before > min_seconds):
+                regressions.append({
+                    "case": case_key(case),
+                    "stage": stage,
+                    "baseline_seconds": before,
+                    "seconds": timing["seconds"],
+                    "ratio": timing["seconds"] / before,
+                })
+    return regressions
+
+
+def print_case(case):
+    print(f"{case_key(case)}  total {case['total_seconds']:.3f}s")
+    for stage, timing in case["stages"].items():
+        peak = timing["peak_rss_bytes"]
+        print(f"  {stage:<10} {timing['seconds']:9.4f}s  "
+              + (f"{peak / 2 ** 20:9.1f} MiB peak RSS" if peak is not None else ""))
+
+
+def parse_list(text, convert):
+    return [convert(float(v)) if convert is int else convert(v) for v in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    parser.add_argument("--rows", help="comma-separated row counts (overrides preset)")
+    parser.add_argument("--criteria", help="comma-separated criteria counts (overrides preset)")
+    parser.add_argument("--dtypes", default="int64,float64")
+    parser.add_argument("--formats", default="csv", help="any of csv,parquet,npy")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help="run_topsis in memory and/or with --chunksize (CSV only)")
+    parser.add_argument("--chunksize", type=int, default=100_000,
+                        help="rows per chunk in chunked mode")
+    parser.add_argument("--max-bytes", type=float, default=4 * 2 ** 30,
+                        help="skip cases whose float64 matrix is larger than this")
+    parser.add_argument("--output", default=os.path.join(HERE, "results.json"))
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="report stages slower than baseline by this factor")
+    parser.add_argument("--min-seconds", type=float, default=0.01,
+                        help="ignore slowdowns smaller than this (timer noise)")
+    args = parser.parse_args(argv)
+
+    rows, criteria = PRESETS[args.preset]
+    if args.rows:
+        rows = parse_list(args.rows, int)
+    if args.criteria:
+        criteria = parse_list(args.criteria, int)
+
+    results = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cases": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for fmt in parse_list(args.formats, str):
+            for mode in parse_list(args.modes, str):
+                if mode == "chunked" and fmt != "csv":
+                    continue
+                for dtype in parse_list(args.dtypes, str):
+                    for n in rows:
+                        for m in criteria:
+                            if n * m * 8 > args.max_bytes:
+                                print(f"skip {fmt}/{mode}/{dtype}/{n}x{m}: over --max-bytes")
+                                continue
+                            case = run_case(n, m, dtype, fmt, mode, args.chunksize, workdir)
+                            results["cases"].append(case)
+                            print_case(case)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    status = 0
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance,
+                                  args.min_seconds)
+        if regressions:
+            status = 1
+            print(f"\n{len(regressions)} stage(s) slower than baseline x{args.tolerance}:")
+            for r in regressions:
+                print(f"  {r['case']} {r['stage']}: {r['baseline_seconds']:.4f}s -> "
+                      f"{r['seconds']:.4f}s (x{r['ratio']:.2f})")
+        else:
+            print("\nNo regressions against baseline.")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Check that the console script's fast path writes the same file as run_topsis.
+
+Run from the ``Assignment - Topsis`` directory:
+
+    python benchmarks/check_fast_path.py
+    python benchmarks/check_fast_path.py --cases 1000 --seed 7
+
+The fast path in ``cli.py`` repeats numpy's summation order (pairwise
+summation with an 8-way unrolled inner loop over blocks of 128) to produce
+byte-identical output. That order is a numpy implementation detail, so
+this script writes random CSV inputs -- integer and float columns, ties,
+2 to 300 criteria (beyond one 128-element block), mixed impacts -- scores
+each with ``cli._run_fast`` and with ``topsis.run_topsis`` and compares the
+two output files byte for byte. Exits with status 1 on any difference.
+Inputs the fast path declines (for example identical rows, whose score is
+0/0) are counted but not compared.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topsis_vansh_102303806 import cli, topsis  # noqa: E402
+
+
+def write_case(path, rng):
+    n = rng.choice([2, 3, rng.randint(4, 50), rng.randint(50, 600)])
+    m = rng.choice([2, rng.randint(3, 20), rng.randint(100, 300)])
+    # Stay under the fast path's size limit (cells are at most ~16 bytes)
+    n = max(2, min(n, cli.FAST_PATH_BYTES // (16 * (m + 1))))
+    is_int = [rng.random() < 0.4 for _ in range(m)]
+    # A small pool of values per column gives tied scores now and then
+    pools = [[rng.randint(1, 99) if flag else round(rng.uniform(0.01, 1000.0), rng.randint(0, 6))
+              for _ in range(rng.choice([3, n]))] for flag in is_int]
+
+    with open(path, "w") as f:
+        f.write(",".join(["Name"] + [f"C{j}" for j in range(1, m + 1)]) + "\n")
+        for i in range(n):
+            cells = [str(rng.choice(pool)) if flag else repr(float(rng.choice(pool)))
+                     for pool, flag in zip(pools, is_int)]
+            f.write(",".join([f"M{i}"] + cells) + "\n")
+
+    weights = ",".join(str(rng.choice([1, 2, 0.5, round(rng.uniform(0.1, 5), 3)])) for _ in range(m))
+    impacts = ",".join(rng.choice("+-") for _ in range(m))
+    return weights, impacts
+
+
+def check(workdir, rng):
+    input_file = os.path.join(workdir, "input.csv")
+    fast_file = os.path.join(workdir, "fast.csv")
+    full_file = os.path.join(workdir, "full.csv")
+    weights, impacts = write_case(input_file, rng)
+
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        # pandas warns about fragmented frames on inputs with many columns
+        warnings.simplefilter("ignore")
+        try:
+            cli._run_fast([input_file, weights, impacts, fast_file])
+        except cli._Unsupported:
+            return "declined"
+        topsis.run_topsis(input_file, [float(w) for w in weights.split(",")],
+                          impacts.split(","), full_file)
+
+    with open(fast_file, "rb") as a, open(full_file, "rb") as b:
+        return "ok" if a.read() == b.read() else "differs"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    outcomes = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(args.cases):
+            outcomes.append(check(workdir, rng))
+
+    compared = args.cases - outcomes.count("declined")
+    print(f"numpy {np.__version__}: {outcomes.count('ok')}/{compared} fast-path outputs "
+          f"identical to run_topsis ({outcomes.count('declined')} input(s) declined)")
+    for case, outcome in enumerate(outcomes):
+        if outcome == "differs":
+            print(f"  case {case} (--seed {args.seed}): output differs")
+    return 1 if "differs" in outcomes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
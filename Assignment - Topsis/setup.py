@@ -11,9 +11,10 @@ setup(
     long_description_content_type="text/markdown",
     packages=find_packages(),
     install_requires=["pandas", "numpy"],
+    extras_require={"arrow": ["pyarrow"]},
     entry_points={
         "console_scripts": [
-            "topsis=topsis_vansh_102303806.topsis:main"
+            "topsis=topsis_vansh_102303806.cli:main"
         ]
     },
     python_requires=">=3.7",
@@ -1 +1,29 @@
 __version__ = "0.0.2"
+
+# Imported on first use so that the console script (cli.py) can start
+# without loading pandas and numpy.
+_EXPORTS = {
+    "run_topsis": "topsis",
+    "run_topsis_scenarios": "topsis",
+    "topsis_scenarios": "topsis",
+    "topsis_scores": "topsis",
+    "precision_report": "topsis",
+    "TopsisIndex": "index",
+    "run_topsis_sharded": "parallel",
+    "run_batch": "batch",
+    "TopsisService": "service",
+    "StageProfiler": "profiling",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,124 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .topsis import run_topsis
+
+SUMMARY_FIELDS = ["job", "input", "output", "status", "seconds", "error"]
+
+
+def _split(value):
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",")]
+    return list(value)
+
+
+def read_manifest(manifest_file):
+    """Return the jobs listed in a JSON-lines or CSV manifest.
+
+    Every job has ``input``, ``weights``, ``impacts`` and ``output``, plus
+    optional ``chunksize`` and ``top_k``. Weights and impacts are either
+    lists or comma-separated strings. A line that cannot be parsed becomes
+    a job carrying an ``error`` so it is reported with the others.
+    """
+    with open(manifest_file, newline="") as f:
+        if manifest_file.lower().endswith(".csv"):
+            records = list(csv.DictReader(f))
+        else:
+            records = []
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError as e:
+                    records.append({"error": f"Invalid manifest line: {e}"})
+
+    jobs = []
+    for record in records:
+        if "error" in record:
+            jobs.append(record)
+            continue
+        missing = [k for k in ("input", "weights", "impacts", "output") if not record.get(k)]
+        if missing:
+            jobs.append({"input": record.get("input"), "output": record.get("output"),
+                         "error": f"Missing field(s): {', '.join(missing)}"})
+            continue
+        job = {
+            "input": record["input"],
+            "weights": _split(record["weights"]),
+            "impacts": _split(record["impacts"]),
+            "output": record["output"],
+        }
+        for key in ("chunksize", "top_k"):
+            if record.get(key) not in (None, ""):
+                job[key] = record[key]
+        jobs.append(job)
+    return jobs
+
+
+def _run_job(job):
+    result = {"input": job.get("input"), "output": job.get("output"), "error": ""}
+    start = time.perf_counter()
+    try:
+        if "error" in job:
+            raise ValueError(job["error"])
+        weights = [float(w) for w in job["weights"]]
+        chunksize = int(job["chunksize"]) if "chunksize" in job else None
+        top_k = int(job["top_k"]) if "top_k" in job else None
+
+        # Keep the per-job success message out of the batch output
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_topsis(job["input"], weights, job["impacts"], job["output"],
+                       chunksize=chunksize, top_k=top_k)
+        result["status"] = "ok"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(manifest_file, processes=None, summary_file=None):
+    """Run every job in ``manifest_file`` on a pool of worker processes.
+
+    Jobs go through ``run_topsis`` with its usual validation; a failing job
+    is recorded in the summary and does not stop the others. The summary
+    (one row per job with status, seconds and error) is written to
+    ``summary_file`` as CSV, or JSON when the name ends in ``.json``.
+    Returns the list of per-job results.
+    """
+    if not os.path.isfile(manifest_file):
+        raise FileNotFoundError("Manifest file not found.")
+
+    jobs = read_manifest(manifest_file)
+    start = time.perf_counter()
+    workers = processes or os.cpu_count() or 1
+    chunk = max(1, len(jobs) // (4 * workers))
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(_run_job, jobs, chunksize=chunk))
+    elapsed = time.perf_counter() - start
+
+    for number, result in enumerate(results, 1):
+        result["job"] = number
+
+    if summary_file is not None:
+        if summary_file.lower().endswith(".json"):
+            with open(summary_file, "w") as f:
+                json.dump(results, f, indent=2)
+        else:
+            with open(summary_file, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+                writer.writeheader()
+                writer.writerows(results)
+
+    failed = [r for r in results if r["status"] != "ok"]
+    for r in failed:
+        print(f"Job {r['job']} ({r['input']}): Error: {r['error']}")
+    print(f"Batch completed: {len(results) - len(failed)} succeeded, "
+          f"{len(failed)} failed, {elapsed:.2f}s wall time.")
+    return results
@@ -0,0 +1,222 @@
+"""Entry point of the ``topsis`` console script.
+
+Plain CSV jobs small enough to read at once are scored here with the
+standard library only, so a run on a handful of rows does not pay for
+importing pandas and numpy. The arithmetic follows the array code in
+``topsis.py`` operation for operation (including numpy's summation order),
+so the output file is the same. Anything else -- other formats, options,
+weight files, unusual cells or any error -- is handed to ``topsis.main``.
+"""
+import csv
+import math
+import os
+import re
+import sys
+
+# Inputs above this size go to the pandas path
+FAST_PATH_BYTES = 256 * 1024
+
+# Must match topsis.BLOCK_ROWS
+BLOCK_ROWS = 4096
+
+_INT = re.compile(r"[+-]?\d{1,18}\Z")
+_FLOAT = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\Z")
+
+# Cells pandas would read as missing, boolean or infinite
+_SPECIAL = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null", "True", "False", "TRUE", "FALSE", "true", "false",
+}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _exact_float(cell):
+    # pandas' float parser agrees with float() when the digits fit a double
+    # exactly and the power of ten it scales by is exact as well.
+    match = _FLOAT.match(cell)
+    if not match:
+        return False
+    mantissa = match.group(1)
+    whole, _, frac = mantissa.partition(".")
+    digits = (whole + frac).lstrip("0")
+    exponent = int(match.group(2)[1:]) if match.group(2) else 0
+    return len(digits) <= 15 and abs(exponent - len(frac)) <= 22
+
+
+def _is_plain_string(cell):
+    if cell in _SPECIAL or _FLOAT.match(cell):
+        return False
+    return cell.lower().lstrip("+-") not in ("inf", "infinity")
+
+
+def _pairwise_sum(a, lo, n):
+    # numpy's pairwise summation, used for sums along a contiguous axis
+    if n < 8:
+        res = 0.0
+        for i in range(lo, lo + n):
+            res += a[i]
+        return res
+    if n <= 128:
+        r = a[lo:lo + 8]
+        i = 8
+        while i < n - n % 8:
+            for k in range(8):
+                r[k] += a[lo + i + k]
+            i += 8
+        res = ((r[0] + r[1]) + (r[2] + r[3])) + ((r[4] + r[5]) + (r[6] + r[7]))
+        for j in range(lo + i, lo + n):
+            res += a[j]
+        return res
+    n2 = n // 2
+    n2 -= n2 % 8
+    return _pairwise_sum(a, lo, n2) + _pairwise_sum(a, lo + n2, n - n2)
+
+
+def _read_small_csv(input_file):
+    with open(input_file, newline="", encoding="utf-8-sig") as f:
+        rows = [row for row in csv.reader(f) if row]
+
+    if len(rows) < 2:
+        raise _Unsupported
+    header, body = rows[0], rows[1:]
+    m = len(header) - 1
+    if m < 2 or "" in header or len(set(header)) != len(header):
+        raise _Unsupported
+    if any(len(row) != len(header) for row in body):
+        raise _Unsupported
+    if not all(_is_plain_string(row[0]) for row in body):
+        raise _Unsupported
+
+    is_int = []
+    for j in range(1, m + 1):
+        cells = [row[j] for row in body]
+        if all(_INT.match(c) for c in cells):
+            is_int.append(True)
+        elif all(_exact_float(c) for c in cells):
+            is_int.append(False)
+        else:
+            raise _Unsupported
+
+    values = [[float(c) for c in row[1:]] for row in body]
+    return header, body, is_int, values
+
+
+def _scores(values, weights, impacts):
+    n, m = len(values), len(weights)
+
+    # Step 1: Normalize (blocked column sums, as _add_sum_of_squares)
+    total = [0.0] * m
+    for start in range(0, n, BLOCK_ROWS):
+        block = values[start:start + BLOCK_ROWS]
+        acc = [v * v for v in block[0]]
+        for row in block[1:]:
+            for j in range(m):
+                acc[j] += row[j] * row[j]
+        for j in range(m):
+            total[j] += acc[j]
+    norm = [math.sqrt(t) for t in total]
+
+    # Step 2: Apply weights
+    weighted = [[row[j] / norm[j] * weights[j] for j in range(m)] for row in values]
+
+    # Step 3: Ideal best and worst, from the weighted raw extremes
+    ideal_best, ideal_worst = [], []
+    for j in range(m):
+        a = min(row[j] for row in values) / norm[j] * weights[j]
+        b = max(row[j] for row in values) / norm[j] * weights[j]
+        low, high = min(a, b), max(a, b)
+        ideal_best.append(high if impacts[j] == "+" else low)
+        ideal_worst.append(low if impacts[j] == "+" else high)
+
+    # Step 4 & 5: Distance and score
+    scores = []
+    for row in weighted:
+        d_best = math.sqrt(_pairwise_sum(
+            [(row[j] - ideal_best[j]) * (row[j] - ideal_best[j]) for j in range(m)], 0, m))
+        d_worst = math.sqrt(_pairwise_sum(
+            [(row[j] - ideal_worst[j]) * (row[j] - ideal_worst[j]) for j in range(m)], 0, m))
+        scores.append(d_worst / (d_best + d_worst))
+    return scores
+
+
+def _ranks(scores):
+    # Average rank of ties, truncated to int, as pandas rank().astype(int)
+    order = sorted(range(len(scores)), key=lambda i: -scores[i])
+    ranks = [0] * len(scores)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and scores[order[j + 1]] == scores[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = int((i + 1 + j + 1) / 2)
+        i = j + 1
+    return ranks
+
+
+def _run_fast(args):
+    input_file, weights, impacts, output_file = args
+
+    if not (input_file.lower().endswith(".csv") and output_file.lower().endswith(".csv")):
+        raise _Unsupported
+    if not os.path.isfile(input_file) or os.path.getsize(input_file) > FAST_PATH_BYTES:
+        raise _Unsupported
+    if os.path.isfile(weights):
+        raise _Unsupported
+
+    try:
+        weights = [float(w) for w in weights.split(",")]
+    except ValueError:
+        raise _Unsupported
+    impacts = impacts.split(",")
+
+    header, body, is_int, values = _read_small_csv(input_file)
+    if len(weights) != len(header) - 1 or len(impacts) != len(weights):
+        raise _Unsupported
+    if any(i not in ("+", "-") for i in impacts):
+        raise _Unsupported
+
+    try:
+        scores = _scores(values, weights, impacts)
+    except ZeroDivisionError:
+        raise _Unsupported
+    if any(math.isnan(s) for s in scores):
+        raise _Unsupported
+    ranks = _ranks(scores)
+
+    with open(output_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(header + ["Topsis Score", "Rank"])
+        for row, vals, score, rank in zip(body, values, scores, ranks):
+            cells = [str(int(c)) if flag else repr(v)
+                     for c, v, flag in zip(row[1:], vals, is_int)]
+            writer.writerow([row[0]] + cells + [repr(score), rank])
+
+    print("TOPSIS analysis completed successfully.")
+
+
+def main():
+    args = sys.argv[1:]
+
+    # Allow: topsis topsis.py input.csv weights impacts output.csv
+    if len(args) == 5 and args[0].endswith(".py"):
+        args = args[1:]
+
+    if len(args) == 4 and not any(a.startswith("--") for a in args):
+        try:
+            _run_fast(args)
+            return
+        except (_Unsupported, OSError, UnicodeDecodeError, csv.Error):
+            pass
+
+    from topsis_vansh_102303806.topsis import main as full_main
+
+    full_main()
+
+
+if __name__ == "__main__":
+    main()
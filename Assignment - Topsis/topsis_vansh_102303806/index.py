@@ -0,0 +1,182 @@
+import numbers
+
+import numpy as np
+import pandas as pd
+
+from .topsis import (
+    _add_sum_of_squares,
+    _check_criteria,
+    _closeness,
+    _ideal_points,
+    _rank,
+    _weigh,
+)
+
+
+class TopsisIndex:
+    """TOPSIS scores for a set of alternatives that changes over time.
+
+    The index keeps the per-criterion sum of squares and min/max of the rows
+    it holds, so adding rows costs O(m) each and the scores are only brought
+    up to date when they are read. If the normalization and ideal points are
+    unchanged since the last read, only the newly added rows are scored;
+    otherwise every row is rescored in one vectorized pass.
+
+    Note that vector normalization changes whenever a non-zero row is added
+    or removed, so in practice a read after a change is a full rescore; the
+    saving is that any number of changes between two reads costs a single
+    rescore. Use ``score(rows)`` to score candidates against the current
+    index in O(m) each without inserting them.
+    """
+
+    def __init__(self, weights, impacts):
+        self.weights, self.impacts = _check_criteria(weights, impacts, len(weights))
+        m = len(self.weights)
+
+        self._values = np.empty((0, m))
+        self._scores = np.empty(0)
+        self._n = 0
+        self._ids = []
+        self._positions = {}
+        self._next_id = 0
+
+        self._sum_sq = np.zeros(m)
+        self._min = np.full(m, np.inf)
+        self._max = np.full(m, -np.inf)
+        # Set by remove(): running statistics must be recomputed from the rows
+        self._stale = False
+
+        # (norm, ideal_best, ideal_worst) that rows [0, _scored) were scored with
+        self._state = None
+        self._scored = 0
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, row_id):
+        return row_id in self._positions
+
+    def _as_rows(self, rows):
+        rows = np.array(rows, dtype=float, ndmin=2, order="C")
+        if rows.ndim != 2 or rows.shape[1] != len(self.weights):
+            raise ValueError("Number of weights and impacts must match number of criteria.")
+        return rows
+
+    def add(self, rows, ids=None):
+        """Append ``rows`` (one per alternative) and return their ids."""
+        rows = self._as_rows(rows)
+        k = len(rows)
+
+        if ids is None:
+            ids = list(range(self._next_id, self._next_id + k))
+        else:
+            ids = list(ids)
+            if len(ids) != k:
+                raise ValueError("Number of ids must match number of rows.")
+        for row_id in ids:
+            if row_id in self._positions:
+                raise ValueError(f"Alternative {row_id!r} is already in the index.")
+        if len(set(ids)) != k:
+            raise ValueError("Ids must be unique.")
+
+        if self._n + k > len(self._values):
+            capacity = max(2 * len(self._values), self._n + k)
+            values = np.empty((capacity, rows.shape[1]))
+            values[:self._n] = self._values[:self._n]
+            scores = np.empty(capacity)
+            scores[:self._n] = self._scores[:self._n]
+            self._values, self._scores = values, scores
+
+        self._values[self._n:self._n + k] = rows
+        for offset, row_id in enumerate(ids):
+            self._positions[row_id] = self._n + offset
+        self._ids.extend(ids)
+        self._n += k
+
+        for row_id in ids:
+            # numpy integers too, so that automatic ids never collide with them
+            if isinstance(row_id, numbers.Integral) and row_id >= self._next_id:
+                self._next_id = int(row_id) + 1
+
+        if not self._stale and k:
+            _add_sum_of_squares(rows, self._sum_sq)
+            np.minimum(self._min, rows.min(axis=0), out=self._min)
+            np.maximum(self._max, rows.max(axis=0), out=self._max)
+        return ids
+
+    def remove(self, ids):
+        """Drop the alternatives with the given ids."""
+        ids = list(ids)
+        if len(set(ids)) != len(ids):
+            raise ValueError("Ids must be unique.")
+        for row_id in ids:
+            if row_id not in self._positions:
+                raise KeyError(row_id)
+
+        for row_id in ids:
+            # Move the last row into the freed slot
+            pos = self._positions.pop(row_id)
+            last = self._n - 1
+            if pos != last:
+                self._values[pos] = self._values[last]
+                self._scores[pos] = self._scores[last]
+                moved = self._ids[last]
+                self._ids[pos] = moved
+                self._positions[moved] = pos
+            self._ids.pop()
+            self._n -= 1
+
+        if ids:
+            self._stale = True
+            self._state = None
+
+    def _statistics(self):
+        if self._stale:
+            values = self._values[:self._n]
+            self._sum_sq = _add_sum_of_squares(values, np.zeros(values.shape[1]))
+            if self._n:
+                self._min, self._max = values.min(axis=0), values.max(axis=0)
+            else:
+                self._min = np.full(values.shape[1], np.inf)
+                self._max = np.full(values.shape[1], -np.inf)
+            self._stale = False
+
+        norm = np.sqrt(self._sum_sq)
+        ideal_best, ideal_worst = _ideal_points(
+            self._min, self._max, norm, self.weights, self.impacts
+        )
+        return norm, ideal_best, ideal_worst
+
+    def _refresh(self):
+        state = self._statistics()
+
+        start = self._scored
+        if self._state is None or not all(
+            np.array_equal(a, b) for a, b in zip(state, self._state)
+        ):
+            start = 0
+
+        norm, ideal_best, ideal_worst = state
+        weighted = _weigh(self._values[start:self._n], norm, self.weights)
+        _closeness(weighted, ideal_best, ideal_worst, out=self._scores[start:self._n])
+
+        self._state = state
+        self._scored = self._n
+
+    def score(self, rows):
+        """Score candidate rows against the index without adding them."""
+        rows = self._as_rows(rows)
+        norm, ideal_best, ideal_worst = self._statistics()
+        return _closeness(_weigh(rows, norm, self.weights), ideal_best, ideal_worst)
+
+    def scores(self):
+        """Return the current TOPSIS score of every alternative, by id."""
+        self._refresh()
+        return pd.Series(self._scores[:self._n].copy(), index=list(self._ids),
+                         name="Topsis Score")
+
+    def ranks(self):
+        """Return the current rank of every alternative, by id."""
+        self._refresh()
+        return pd.Series(_rank(self._scores[:self._n]), index=list(self._ids),
+                         name="Rank")
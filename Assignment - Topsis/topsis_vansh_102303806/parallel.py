@@ -0,0 +1,91 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from .topsis import (
+    _add_sum_of_squares,
+    _check_criteria,
+    _closeness,
+    _ideal_points,
+    _rank,
+    _read_input,
+    _weigh,
+    _write_output,
+)
+
+
+def _shard_statistics(path):
+    _, values = _read_input(path)
+    m = values.shape[1]
+    total = _add_sum_of_squares(values, np.zeros(m))
+    if len(values):
+        return len(values), total, values.min(axis=0), values.max(axis=0)
+    return 0, total, np.full(m, np.inf), np.full(m, -np.inf)
+
+
+def _shard_scores(path, norm, weights, ideal_best, ideal_worst):
+    _, values = _read_input(path)
+    weighted = _weigh(values, norm, weights)
+    return _closeness(weighted, ideal_best, ideal_worst)
+
+
+def _write_shard(path, output_path, score, rank):
+    data, _ = _read_input(path)
+    _write_output(data, score, rank, None, output_path)
+
+
+def run_topsis_sharded(pattern, weights, impacts, output_dir, processes=None):
+    """Run TOPSIS over every file matching ``pattern`` as one decision matrix.
+
+    Worker processes compute per-shard sums of squares and column extremes,
+    which are reduced into the global normalization and ideal points. The
+    shards are then scored in parallel, ranked globally, and each shard is
+    written to ``output_dir`` under its own file name.
+    """
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise FileNotFoundError("No input files match the pattern.")
+
+    outputs = [os.path.join(output_dir, os.path.basename(path)) for path in paths]
+    if len(set(outputs)) != len(outputs):
+        raise ValueError("Input shards must have distinct file names.")
+    os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(processes) as pool:
+        # Map: per-shard statistics
+        stats = list(pool.map(_shard_statistics, paths))
+
+        if len({len(total) for _, total, _, _ in stats}) != 1:
+            raise ValueError("All input shards must have the same number of criteria.")
+        weights, impacts = _check_criteria(weights, impacts, len(stats[0][1]))
+
+        # Reduce: global normalization and ideal points
+        total = np.zeros(len(weights))
+        for _, shard_total, _, _ in stats:
+            total += shard_total
+        col_min = np.min([shard_min for _, _, shard_min, _ in stats], axis=0)
+        col_max = np.max([shard_max for _, _, _, shard_max in stats], axis=0)
+
+        norm = np.sqrt(total)
+        ideal_best, ideal_worst = _ideal_points(col_min, col_max, norm, weights, impacts)
+
+        # Second pass: score every shard
+        scores = list(pool.map(
+            _shard_scores, paths, repeat(norm), repeat(weights),
+            repeat(ideal_best), repeat(ideal_worst),
+        ))
+
+        # Global ranks, then write the shards with their slice of them
+        score = np.concatenate(scores)
+        rank = _rank(score)
+        bounds = np.cumsum([0] + [len(s) for s in scores])
+        list(pool.map(
+            _write_shard, paths, outputs,
+            [score[a:b] for a, b in zip(bounds[:-1], bounds[1:])],
+            [rank[a:b] for a, b in zip(bounds[:-1], bounds[1:])],
+        ))
+
+    print("TOPSIS analysis completed successfully.")
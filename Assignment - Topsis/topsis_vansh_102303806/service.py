@@ -0,0 +1,276 @@
+"""Resident TOPSIS scoring service.
+
+A reference decision matrix is loaded once; its column norms, ideal best
+and worst points and sorted reference scores stay in memory. Each query
+row is then scored in O(m) and ranked against the reference scores with a
+binary search. Queries arriving together are scored as one micro-batch,
+and the reference file is reloaded when it changes on disk.
+
+Two transports are provided, both speaking JSON:
+
+* JSON lines over stdin/stdout: one request per line,
+  ``{"id": 1, "rows": [[250, 7, 4, 8]]}``, answered by
+  ``{"id": 1, "scores": [...], "ranks": [...]}`` in the same order.
+* HTTP: ``POST /score`` with the same request body, ``GET /health``.
+
+Candidates are scored against the reference as it is; they are not added
+to it, so the normalization does not move between queries. A candidate's
+rank is its position among the reference scores (1 + the number of
+reference alternatives with a higher score).
+"""
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .topsis import (
+    _add_sum_of_squares,
+    _check_criteria,
+    _check_input_file,
+    _closeness,
+    _ideal_points,
+    _read_input,
+    _weigh,
+)
+
+
+class TopsisService:
+    """Score candidates against a reference matrix kept in memory."""
+
+    def __init__(self, reference_file, weights, impacts, reload_interval=1.0):
+        self.reference_file = reference_file
+        self.reload_interval = reload_interval
+        self._weights_arg = weights
+        self._impacts_arg = impacts
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._load()
+
+    def _load(self):
+        _check_input_file(self.reference_file)
+        stat = os.stat(self.reference_file)
+        _, values = _read_input(self.reference_file)
+        values = np.array(values, dtype=float, order="C")
+        weights, impacts = _check_criteria(self._weights_arg, self._impacts_arg, values.shape[1])
+
+        norm = np.sqrt(_add_sum_of_squares(values, np.zeros(values.shape[1])))
+        ideal_best, ideal_worst = _ideal_points(
+            values.min(axis=0), values.max(axis=0), norm, weights, impacts
+        )
+        score = _closeness(_weigh(values, norm, weights, out=values), ideal_best, ideal_worst)
+
+        with self._lock:
+            self.weights = weights
+            self.norm = norm
+            self.ideal_best = ideal_best
+            self.ideal_worst = ideal_worst
+            # Ascending; NaN scores (degenerate rows) are left out of ranking
+            self._sorted = np.sort(score[~np.isnan(score)])
+            self._signature = (stat.st_mtime_ns, stat.st_size)
+
+    def maybe_reload(self):
+        """Reload the reference if the file changed; returns True if it did."""
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return False
+        self._checked = now
+
+        try:
+            stat = os.stat(self.reference_file)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == self._signature:
+            return False
+
+        try:
+            self._load()
+        except Exception as e:
+            # Keep serving the previous reference (e.g. file half written)
+            print(f"Reload failed, keeping previous reference: {e}", file=sys.stderr)
+            return False
+        return True
+
+    @property
+    def n_criteria(self):
+        return len(self.weights)
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def check_rows(self, rows):
+        rows = np.array(rows, dtype=float, ndmin=2)
+        if rows.ndim != 2 or rows.shape[1] != self.n_criteria:
+            raise ValueError("Each row must have one value per criterion.")
+        return rows
+
+    def score(self, rows):
+        """Return (scores, ranks) of candidate rows against the reference."""
+        rows = self.check_rows(rows)
+        with self._lock:
+            weighted = _weigh(rows, self.norm, self.weights)
+            scores = _closeness(weighted, self.ideal_best, self.ideal_worst)
+            ranks = len(self._sorted) - np.searchsorted(self._sorted, scores, side="right") + 1
+        return scores, ranks
+
+
+class MicroBatcher:
+    """Collect concurrent queries and score them in one call.
+
+    A background thread waits for the first pending query, then keeps
+    collecting for up to ``max_delay`` seconds or ``max_rows`` rows before
+    scoring everything together.
+    """
+
+    def __init__(self, service, max_rows=1024, max_delay=0.002):
+        self.service = service
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, rows):
+        future = Future()
+        try:
+            rows = self.service.check_rows(rows)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+        self._queue.put((rows, future))
+        return future
+
+    def _loop(self):
+        while True:
+            pending = [self._queue.get()]
+            n_rows = len(pending[0][0])
+            deadline = time.monotonic() + self.max_delay
+            while n_rows < self.max_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                n_rows += len(item[0])
+
+            self.service.maybe_reload()
+            try:
+                # A reload may change the number of criteria
+                rows = np.concatenate([self.service.check_rows(r) for r, _ in pending])
+                scores, ranks = self.service.score(rows)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            start = 0
+            for r, future in pending:
+                stop = start + len(r)
+                future.set_result((scores[start:stop], ranks[start:stop]))
+                start = stop
+
+
+def _answer(request, future):
+    try:
+        scores, ranks = future.result()
+        response = {"scores": scores.tolist(), "ranks": ranks.tolist()}
+    except Exception as e:
+        response = {"error": str(e)}
+    if isinstance(request, dict) and "id" in request:
+        response = {"id": request["id"], **response}
+    return response
+
+
+def _submit(batcher, request):
+    if not isinstance(request, dict) or ("rows" not in request and "row" not in request):
+        future = Future()
+        future.set_exception(ValueError('Request must have "rows" or "row".'))
+        return future
+    return batcher.submit(request["rows"] if "rows" in request else [request["row"]])
+
+
+def serve_stdio(service, batcher=None, stdin=None, stdout=None):
+    """Answer JSON-lines requests from stdin, in order, until EOF."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    batcher = batcher or MicroBatcher(service)
+    answers = queue.Queue()
+
+    # Requests are submitted as soon as they are read so that a burst of
+    # lines is scored as one batch; a writer thread answers them in order.
+    def write():
+        while True:
+            item = answers.get()
+            if item is None:
+                return
+            stdout.write(json.dumps(_answer(*item)) + "\n")
+            stdout.flush()
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            future = Future()
+            future.set_exception(ValueError(f"Invalid JSON: {e}"))
+            answers.put((None, future))
+            continue
+        answers.put((request, _submit(batcher, request)))
+    answers.put(None)
+    writer.join()
+
+
+def serve_http(service, host="127.0.0.1", port=8000, batcher=None):
+    """Serve ``POST /score`` and ``GET /health`` until interrupted."""
+    batcher = batcher or MicroBatcher(service)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._send(404, {"error": "Not found."})
+            service.maybe_reload()
+            self._send(200, {"reference": service.reference_file,
+                             "alternatives": len(service),
+                             "criteria": service.n_criteria})
+
+        def do_POST(self):
+            if self.path != "/score":
+                return self._send(404, {"error": "Not found."})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+            except ValueError as e:
+                return self._send(400, {"error": f"Invalid JSON: {e}"})
+            response = _answer(request, _submit(batcher, request))
+            self._send(400 if "error" in response else 200, response)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving TOPSIS scores on http://{host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,87 +1,657 @@
 import pandas as pd
 import numpy as np
+import contextlib
 import sys
 import os
 
-def run_topsis(input_file, weights, impacts, output_file):
+from .profiling import StageProfiler, paused, stage
+
+# Sums of squares are added up block by block so that the in-memory and
+# the chunked paths accumulate in exactly the same order.
+BLOCK_ROWS = 4096
+
+# Upper bound on the scenario x alternative x criteria buffers used when
+# scoring many weight vectors at once.
+SCENARIO_BYTES = 64 * 2 ** 20
+
+# Input/output formats picked by file extension; anything else is CSV.
+FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".npy": "npy",
+}
+
+
+def _check_input_file(input_file):
     # Check file exists
     if not os.path.isfile(input_file):
         raise FileNotFoundError("Input file not found.")
 
-    data = pd.read_csv(input_file)
 
+def _check_frame(data):
     if data.shape[1] < 3:
         raise ValueError("Input file must contain at least 3 columns.")
 
     parameters = data.iloc[:, 1:]
 
     # Check numeric columns
-    if not all(np.issubdtype(dtype, np.number) for dtype in parameters.dtypes):
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in parameters.dtypes):
         raise ValueError("All criteria columns must contain numeric values only.")
 
-    if len(weights) != parameters.shape[1] or len(impacts) != parameters.shape[1]:
+    return parameters
+
+
+def _file_format(path):
+    return FORMATS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def _read_input(input_file, dtype=np.float64):
+    # Returns the input frame (None for .npy) and the criteria as a float array
+    fmt = _file_format(input_file)
+
+    if fmt == "npy":
+        # Memory-mapped: a .npy file holds the criteria matrix only
+        values = np.load(input_file, mmap_mode="r")
+        if values.ndim != 2 or values.shape[1] < 2:
+            raise ValueError("Input array must be two-dimensional with at least 2 criteria columns.")
+        if not np.issubdtype(values.dtype, np.number):
+            raise ValueError("All criteria columns must contain numeric values only.")
+        return None, values
+
+    if fmt == "parquet":
+        data = pd.read_parquet(input_file)
+    elif fmt == "feather":
+        data = pd.read_feather(input_file)
+    else:
+        data = pd.read_csv(input_file)
+
+    parameters = _check_frame(data)
+    return data, np.ascontiguousarray(parameters.to_numpy(dtype=dtype))
+
+
+def _write_output(data, score, rank, rows, output_file):
+    # rows: positions of the written alternatives in the input, None for all
+    fmt = _file_format(output_file)
+
+    if data is None or fmt == "npy":
+        if rows is None:
+            rows = np.arange(len(score))
+        result = pd.DataFrame({"Row": rows, "Topsis Score": score, "Rank": rank})
+    else:
+        result = data if rows is None else data.iloc[rows].copy()
+        result["Topsis Score"] = score
+        result["Rank"] = rank
+
+    if fmt == "npy":
+        np.save(output_file, result.to_records(index=False))
+    elif fmt == "parquet":
+        result.to_parquet(output_file, index=False)
+    elif fmt == "feather":
+        result.reset_index(drop=True).to_feather(output_file)
+    else:
+        result.to_csv(output_file, index=False)
+
+
+def _parse_impacts(impacts):
+    # Element by element, so that a string such as "+-+" gives one impact
+    # per character (np.asarray would make it a single 0-d element)
+    impacts = np.array(list(impacts))
+    if not np.isin(impacts, ['+', '-']).all():
+        raise ValueError("Impacts must be '+' or '-' only.")
+
+    return np.where(impacts == '+', 1, -1)
+
+
+def _add_sum_of_squares(values, total):
+    # total is float64 whatever the dtype of values
+    for start in range(0, len(values), BLOCK_ROWS):
+        block = values[start:start + BLOCK_ROWS]
+        total += (block * block).sum(axis=0, dtype=total.dtype)
+    return total
+
+
+def _check_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("dtype must be float32 or float64.")
+    return dtype
+
+
+def _check_criteria(weights, impacts, n_criteria):
+    if len(weights) != n_criteria or len(impacts) != n_criteria:
         raise ValueError("Number of weights and impacts must match number of criteria.")
 
-    for i in impacts:
-        if i not in ['+', '-']:
-            raise ValueError("Impacts must be '+' or '-' only.")
+    return np.asarray(weights, dtype=float), _parse_impacts(impacts)
+
+
+def _weigh(values, norm, weights, out=None):
+    if out is None:
+        return values / norm * weights
+    np.divide(values, norm, out=out)
+    return np.multiply(out, weights, out=out)
+
+
+def _ideal_points(col_min, col_max, norm, weights, impacts):
+    # Weighting is monotonic per column, so the weighted extremes are the
+    # weighted raw extremes (swapped where a weight is negative).
+    low = _weigh(col_min, norm, weights)
+    high = _weigh(col_max, norm, weights)
+    low, high = np.minimum(low, high), np.maximum(low, high)
+
+    ideal_best = np.where(impacts == 1, high, low)
+    ideal_worst = np.where(impacts == 1, low, high)
+    return ideal_best, ideal_worst
 
-    impacts = [1 if i == '+' else -1 for i in impacts]
+
+def _closeness(weighted, ideal_best, ideal_worst, out=None):
+    n, m = weighted.shape
+    dtype = weighted.dtype
+    if out is None:
+        out = np.empty(n, dtype=dtype)
+    elif out.shape != (n,):
+        raise ValueError("out must have one element per alternative.")
+    ideal_best = ideal_best.astype(dtype, copy=False)
+    ideal_worst = ideal_worst.astype(dtype, copy=False)
+
+    # Distances are taken a block of rows at a time so the only temporary
+    # is a BLOCK_ROWS x m scratch buffer.
+    scratch = np.empty((min(n, BLOCK_ROWS), m), dtype=dtype)
+    d_worst = np.empty(min(n, BLOCK_ROWS), dtype=dtype)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, n, BLOCK_ROWS):
+            block = weighted[start:start + BLOCK_ROWS]
+            tmp = scratch[:len(block)]
+            d_best = out[start:start + len(block)]
+            dw = d_worst[:len(block)]
+
+            for ideal, dist in ((ideal_best, d_best), (ideal_worst, dw)):
+                np.subtract(block, ideal, out=tmp)
+                np.multiply(tmp, tmp, out=tmp)
+                tmp.sum(axis=1, out=dist)
+                np.sqrt(dist, out=dist)
+
+            np.add(d_best, dw, out=d_best)
+            np.divide(dw, d_best, out=d_best)
+    return out
+
+
+def topsis_scores(matrix, weights, impacts, out=None, overwrite_input=False,
+                  dtype=np.float64):
+    """Return the TOPSIS closeness score of every row of ``matrix``.
+
+    ``matrix`` is an (alternatives x criteria) array, ``weights`` one number
+    per criterion and ``impacts`` one '+' or '-' per criterion. Scores are
+    written to ``out`` when given. With ``overwrite_input=True`` a
+    C-contiguous ``matrix`` of the compute dtype is normalized and weighted
+    in place instead of being copied. ``dtype`` is float64 or float32; the
+    latter halves memory and bandwidth (column sums are still accumulated
+    in float64).
+    """
+    dtype = _check_dtype(dtype)
+    if overwrite_input:
+        values = np.require(matrix, dtype=dtype, requirements=["C", "W"])
+    else:
+        values = np.array(matrix, dtype=dtype, order="C")
+
+    if values.ndim != 2:
+        raise ValueError("Decision matrix must be two-dimensional.")
+
+    weights, impacts = _check_criteria(weights, impacts, values.shape[1])
+    weights = weights.astype(dtype)
+    n = len(values)
 
     # Step 1: Normalize
-    norm = parameters / np.sqrt((parameters ** 2).sum())
+    with stage("normalize", n):
+        norm = np.sqrt(_add_sum_of_squares(values, np.zeros(values.shape[1]))).astype(dtype)
+
+    # Step 3 uses the raw extremes, so take them before overwriting
+    with stage("ideal", n):
+        ideal_best, ideal_worst = _ideal_points(
+            values.min(axis=0), values.max(axis=0), norm, weights, impacts
+        )
 
     # Step 2: Apply weights
-    weighted = norm * weights
+    with stage("weight", n):
+        weighted = _weigh(values, norm, weights, out=values)
+
+    # Step 4 & 5: Distance and score
+    with stage("distance", n):
+        return _closeness(weighted, ideal_best, ideal_worst, out=out)
+
+
+def _check_scenarios(weights, impacts, n_criteria):
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim != 2 or weights.shape[1] != n_criteria:
+        raise ValueError("Number of weights and impacts must match number of criteria.")
+
+    impacts = _parse_impacts(impacts)
+    if impacts.shape[-1] != n_criteria:
+        raise ValueError("Number of weights and impacts must match number of criteria.")
+    if impacts.ndim == 2 and impacts.shape[0] != weights.shape[0]:
+        raise ValueError("Impacts must be a single row or one row per weight vector.")
+
+    return weights, impacts
+
+
+def _iter_scenario_scores(matrix, weights, impacts, max_bytes):
+    values = np.array(matrix, dtype=float, order="C")
+    if values.ndim != 2:
+        raise ValueError("Decision matrix must be two-dimensional.")
+
+    n, m = values.shape
+    weights, impacts = _check_scenarios(weights, impacts, m)
+
+    # Step 1: Normalize (once for every scenario)
+    norm = np.sqrt(_add_sum_of_squares(values, np.zeros(m)))
+    col_min, col_max = values.min(axis=0), values.max(axis=0)
+    normalized = np.divide(values, norm, out=values)
+
+    # Two (scenarios x n x m) buffers per chunk of scenarios
+    step = max(1, int(max_bytes // (2 * max(n * m, 1) * normalized.itemsize)))
+    weighted = np.empty((min(step, len(weights)), n, m))
+    tmp = np.empty_like(weighted)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, len(weights), step):
+            w = weights[start:start + step]
+            imp = impacts[start:start + step] if impacts.ndim == 2 else impacts
+            k = len(w)
+
+            # Step 2 & 3: Apply weights, ideal best and worst per scenario
+            W = np.multiply(normalized, w[:, None, :], out=weighted[:k])
+            ideal_best, ideal_worst = _ideal_points(col_min, col_max, norm, w, imp)
+
+            # Step 4 & 5: Distance and score
+            distances = []
+            for ideal in (ideal_best, ideal_worst):
+                diff = np.subtract(W, ideal[:, None, :], out=tmp[:k])
+                np.multiply(diff, diff, out=diff)
+                distances.append(np.sqrt(diff.sum(axis=2)))
+            d_best, d_worst = distances
+
+            yield start, d_worst / (d_best + d_worst)
+
+
+def topsis_scenarios(matrix, weights, impacts, max_bytes=SCENARIO_BYTES):
+    """Score ``matrix`` under many weight vectors at once.
+
+    ``weights`` is a (scenarios x criteria) array and ``impacts`` either one
+    row of '+'/'-' shared by every scenario or one row per scenario. The
+    matrix is normalized once and scenarios are scored in batches whose
+    working buffers stay under ``max_bytes``. Returns ``(scores, ranks)``,
+    both shaped (scenarios x alternatives).
+    """
+    scores = np.empty((len(weights), len(matrix)))
+    for start, chunk in _iter_scenario_scores(matrix, weights, impacts, max_bytes):
+        scores[start:start + len(chunk)] = chunk
+    return scores, _rank(scores)
 
-    # Step 3: Ideal best and worst
-    ideal_best = [
-        weighted.iloc[:, i].max() if impacts[i] == 1 else weighted.iloc[:, i].min()
-        for i in range(len(impacts))
-    ]
-    ideal_worst = [
-        weighted.iloc[:, i].min() if impacts[i] == 1 else weighted.iloc[:, i].max()
-        for i in range(len(impacts))
-    ]
 
-    # Step 4: Distance
-    d_best = np.sqrt(((weighted - ideal_best) ** 2).sum(axis=1))
-    d_worst = np.sqrt(((weighted - ideal_worst) ** 2).sum(axis=1))
+def _rank(score):
+    if np.ndim(score) == 2:
+        ranks = pd.DataFrame(score).rank(axis=1, ascending=False)
+    else:
+        ranks = pd.Series(score).rank(ascending=False)
+    return ranks.astype(int).to_numpy()
 
-    # Step 5: Score
-    score = d_worst / (d_best + d_worst)
+
+def _top_k(score, k):
+    # Positions of the k best scores in rank order (ties in file order) and
+    # their ranks, equal to what _rank gives for those rows.
+    if k < 1:
+        raise ValueError("top_k must be a positive integer.")
+    k = min(k, len(score))
+    if k == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    idx = np.argpartition(-score, k - 1)[:k]
+    top = score[idx]
+
+    # Rows tied with the k-th score may lie outside the selection; pick
+    # the earliest ones so the output does not depend on argpartition.
+    boundary = top.min()
+    ties = np.flatnonzero(score == boundary)
+    above = idx[top > boundary]
+    idx = np.concatenate([above, ties[:k - len(above)]])
+    idx = idx[np.lexsort((idx, -score[idx]))]
+    top = score[idx]
+
+    # Average rank among ties, as pandas does, then truncated like _rank
+    greater = np.searchsorted(-top, -top, side="left")
+    equal = np.searchsorted(-top, -top, side="right") - greater
+    equal[top == boundary] = len(ties)
+    return idx, (greater + (equal + 1) / 2).astype(int)
+
+
+def precision_report(matrix, weights, impacts, dtype=np.float32, score=None):
+    """Compare scores and ranks computed in ``dtype`` with float64.
+
+    Pass ``score`` to reuse scores already computed in ``dtype``. Returns a
+    dict with the largest absolute score difference and the positions of
+    the alternatives whose rank differs.
+    """
+    if score is None:
+        score = topsis_scores(matrix, weights, impacts, dtype=dtype)
+    reference = topsis_scores(matrix, weights, impacts)
+    return _compare_scores(score, reference, dtype)
+
+
+def _compare_scores(score, reference, dtype):
+    changed = np.flatnonzero(_rank(score) != _rank(reference))
+    return {
+        "dtype": str(np.dtype(dtype)),
+        "max_score_error": float(np.nanmax(np.abs(score - reference))) if len(score) else 0.0,
+        "rank_differences": int(len(changed)),
+        "rows": changed.tolist(),
+    }
+
+
+def run_topsis(input_file, weights, impacts, output_file, chunksize=None, top_k=None,
+               dtype=np.float64, check_precision=False):
+    _check_input_file(input_file)
+    dtype = _check_dtype(dtype)
+
+    if chunksize is not None:
+        return _run_topsis_chunked(input_file, weights, impacts, output_file,
+                                   chunksize, top_k, dtype, check_precision)
+
+    with stage("load") as record:
+        # The precision check needs the criteria as read, not rounded to dtype
+        data, values = _read_input(input_file, np.float64 if check_precision else dtype)
+        record["rows"] = len(values)
+    if check_precision:
+        # The float64 input is the reference; the run works on a copy in dtype
+        matrix = values
+        values = np.array(values, dtype=dtype, order="C")
+    score = topsis_scores(values, weights, impacts, overwrite_input=True, dtype=dtype)
+
+    if check_precision:
+        with stage("check_precision", len(score)), paused():
+            report = precision_report(matrix, weights, impacts, dtype, score=score)
+        _print_precision(report)
 
     # Step 6: Rank
-    data["Topsis Score"] = score
-    data["Rank"] = score.rank(ascending=False).astype(int)
+    with stage("rank", len(score)):
+        if top_k is not None:
+            rows, rank = _top_k(score, top_k)
+            score = score[rows]
+        else:
+            rows, rank = None, _rank(score)
+
+    with stage("write", len(score)):
+        _write_output(data, score, rank, rows, output_file)
+    print("TOPSIS analysis completed successfully.")
+
+
+def _print_precision(report):
+    print(f"Precision check ({report['dtype']} vs float64): "
+          f"max score difference {report['max_score_error']:.3g}, "
+          f"{report['rank_differences']} rank difference(s).")
+
+
+def _chunked_scores(input_file, weights, impacts, chunksize, dtype):
+    # Passes 1 and 2 of the chunked mode: the scores, and the float columns
+    # of the input (pass 3 writes those back as floats)
+
+    # Pass 1: column sums of squares and raw min/max. Sums of squares are
+    # added a whole block at a time (see BLOCK_ROWS); the rows of a block
+    # that straddles two chunks are carried over to the next chunk.
+    total = col_min = col_max = None
+    carried = None
+    float_cols = set()
+    n_rows = 0
+    with stage("statistics") as record:
+        for chunk in pd.read_csv(input_file, chunksize=chunksize):
+            parameters = _check_frame(chunk)
+            if total is None:
+                weight_vec, impact_vec = _check_criteria(weights, impacts, parameters.shape[1])
+                total = np.zeros(parameters.shape[1])
+                col_min = np.full(parameters.shape[1], np.inf, dtype=dtype)
+                col_max = np.full(parameters.shape[1], -np.inf, dtype=dtype)
+
+            float_cols.update(
+                name for name, col_dtype in chunk.dtypes.items()
+                if pd.api.types.is_float_dtype(col_dtype)
+            )
+
+            values = np.ascontiguousarray(parameters.to_numpy(dtype=dtype))
+            np.minimum(col_min, values.min(axis=0), out=col_min)
+            np.maximum(col_max, values.max(axis=0), out=col_max)
+            n_rows += len(values)
+
+            if carried is not None:
+                values = np.concatenate([carried, values])
+            whole = len(values) - len(values) % BLOCK_ROWS
+            _add_sum_of_squares(values[:whole], total)
+            carried = values[whole:]
+        if carried is not None:
+            _add_sum_of_squares(carried, total)
+        record["rows"] = n_rows
+
+    if total is None:
+        raise ValueError("Input file contains no rows.")
+
+    norm = np.sqrt(total).astype(dtype)
+    weight_vec = weight_vec.astype(dtype)
+    ideal_best, ideal_worst = _ideal_points(col_min, col_max, norm, weight_vec, impact_vec)
+
+    # Pass 2: scores (only one float per row is kept in memory)
+    scores = []
+    with stage("score") as record:
+        for chunk in pd.read_csv(input_file, chunksize=chunksize):
+            values = np.ascontiguousarray(chunk.iloc[:, 1:].to_numpy(dtype=dtype))
+            weighted = _weigh(values, norm, weight_vec, out=values)
+            scores.append(_closeness(weighted, ideal_best, ideal_worst))
+        score = np.concatenate(scores)
+        record["rows"] = len(score)
+    return score, float_cols
+
+
+def _run_topsis_chunked(input_file, weights, impacts, output_file, chunksize,
+                        top_k=None, dtype=np.float64, check_precision=False):
+    if chunksize < 1:
+        raise ValueError("Chunk size must be a positive integer.")
+    if _file_format(input_file) != "csv" or _file_format(output_file) != "csv":
+        raise ValueError("Chunked mode reads and writes CSV files only.")
+
+    score, float_cols = _chunked_scores(input_file, weights, impacts, chunksize, dtype)
+
+    if check_precision:
+        # Two more passes in float64; only the reference scores are kept
+        with stage("check_precision", len(score)), paused():
+            reference, _ = _chunked_scores(input_file, weights, impacts, chunksize, np.float64)
+            report = _compare_scores(score, reference, dtype)
+        _print_precision(report)
+
+    if top_k is not None:
+        with stage("rank", len(score)):
+            idx, rank = _top_k(score, top_k)
+            selected = np.zeros(len(score), dtype=bool)
+            selected[idx] = True
+
+        # Pass 3: keep only the selected rows and write them in rank order
+        with stage("write", len(score)):
+            parts = []
+            start = 0
+            for chunk in pd.read_csv(input_file, chunksize=chunksize):
+                stop = start + len(chunk)
+                parts.append(chunk[selected[start:stop]])
+                start = stop
+            data = pd.concat(parts).loc[idx]
+            for name in float_cols.intersection(data.columns):
+                data[name] = data[name].astype(float)
+            data["Topsis Score"] = score[idx]
+            data["Rank"] = rank
+            data.to_csv(output_file, index=False)
+        print("TOPSIS analysis completed successfully.")
+        return
+
+    with stage("rank", len(score)):
+        rank = _rank(score)
+
+    # Pass 3: stream the annotated rows out
+    with stage("write", len(score)):
+        start = 0
+        for chunk in pd.read_csv(input_file, chunksize=chunksize):
+            stop = start + len(chunk)
+            for name in float_cols.intersection(chunk.columns):
+                chunk[name] = chunk[name].astype(float)
+            chunk["Topsis Score"] = score[start:stop]
+            chunk["Rank"] = rank[start:stop]
+            chunk.to_csv(output_file, mode="w" if start == 0 else "a",
+                         header=start == 0, index=False)
+            start = stop
 
-    data.to_csv(output_file, index=False)
     print("TOPSIS analysis completed successfully.")
 
 
+def run_topsis_scenarios(input_file, weights, impacts, output_file,
+                         max_bytes=SCENARIO_BYTES):
+    _check_input_file(input_file)
+
+    data, values = _read_input(input_file)
+    if data is None:
+        name, names = "Row", np.arange(len(values))
+    else:
+        name, names = data.columns[0], data.iloc[:, 0].to_numpy()
+
+    # One row per (scenario, alternative), written a batch at a time
+    first = True
+    for start, score in _iter_scenario_scores(values, weights, impacts, max_bytes):
+        k, n = score.shape
+        pd.DataFrame({
+            "Scenario": np.repeat(np.arange(start + 1, start + k + 1), n),
+            name: np.tile(names, k),
+            "Topsis Score": score.ravel(),
+            "Rank": _rank(score).ravel(),
+        }).to_csv(output_file, mode="w" if first else "a", header=first, index=False)
+        first = False
+
+    print("TOPSIS analysis completed successfully.")
+
+
+def _read_rows(path, convert):
+    with open(path) as f:
+        return [[convert(v.strip()) for v in line.split(",")] for line in f if line.strip()]
+
+
+# Options that take no value
+FLAGS = {"check-precision", "profile"}
+
+
+def _parse_options(args):
+    options = {}
+    positional = []
+    i = 0
+    while i < len(args):
+        if args[i][2:] in FLAGS and args[i].startswith("--"):
+            options[args[i][2:]] = True
+            i += 1
+        elif args[i].startswith("--") and i + 1 < len(args):
+            options[args[i][2:]] = args[i + 1]
+            i += 2
+        else:
+            positional.append(args[i])
+            i += 1
+    return positional, options
+
+
 def main():
-    args = sys.argv[1:]
+    args, options = _parse_options(sys.argv[1:])
 
     # Allow: topsis topsis.py input.csv weights impacts output.csv
     if len(args) == 5 and args[0].endswith(".py"):
         args = args[1:]
 
+    # Batch mode: topsis --batch manifest.jsonl [--processes N] [--summary file]
+    if "batch" in options and not args:
+        from topsis_vansh_102303806.batch import run_batch
+
+        try:
+            processes = int(options["processes"]) if "processes" in options else None
+            results = run_batch(options["batch"], processes=processes,
+                                summary_file=options.get("summary"))
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if any(r["status"] != "ok" for r in results):
+            sys.exit(1)
+        return
+
+    # Service mode: topsis <ReferenceFile> <Weights> <Impacts> --serve stdio|[HOST:]PORT
+    if "serve" in options and len(args) == 3:
+        from topsis_vansh_102303806.service import TopsisService, serve_http, serve_stdio
+
+        try:
+            service = TopsisService(args[0], list(map(float, args[1].split(","))),
+                                    args[2].split(","))
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if options["serve"] == "stdio":
+            serve_stdio(service)
+        else:
+            host, _, port = options["serve"].rpartition(":")
+            serve_http(service, host or "127.0.0.1", int(port))
+        return
+
     if len(args) != 4:
         print("Usage:")
-        print('topsis topsis.py <InputDataFile> <Weights> <Impacts> <OutputFile>')
+        print('topsis topsis.py <InputDataFile> <Weights> <Impacts> <OutputFile> [--chunksize N] [--top-k N]')
+        print('    [--dtype float32|float64] [--check-precision] [--profile] [--profile-output <JsonFile>]')
+        print('topsis topsis.py <InputDataFile> <WeightsFile> <Impacts|ImpactsFile> <OutputFile>')
+        print('topsis topsis.py "<InputGlob>" <Weights> <Impacts> <OutputDir> [--processes N]')
+        print('topsis --batch <ManifestFile> [--processes N] [--summary <SummaryFile>]')
+        print('topsis topsis.py <ReferenceFile> <Weights> <Impacts> --serve stdio|[HOST:]PORT')
         sys.exit(1)
 
     input_file = args[0]
+    output_file = args[3]
+
+    # Weights (and optionally impacts) given as a file: one scenario per line
+    if os.path.isfile(args[1]):
+        try:
+            weights = _read_rows(args[1], float)
+            impacts = _read_rows(args[2], str) if os.path.isfile(args[2]) else args[2].split(",")
+            run_topsis_scenarios(input_file, weights, impacts, output_file)
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
     weights = list(map(float, args[1].split(",")))
     impacts = args[2].split(",")
-    output_file = args[3]
 
     try:
-        run_topsis(input_file, weights, impacts, output_file)
+        # A glob pattern: sharded input, output is a directory
+        if any(c in input_file for c in "*?["):
+            from topsis_vansh_102303806.parallel import run_topsis_sharded
+
+            processes = int(options["processes"]) if "processes" in options else None
+            run_topsis_sharded(input_file, weights, impacts, output_file, processes=processes)
+            return
+
+        chunksize = int(options["chunksize"]) if "chunksize" in options else None
+        top_k = int(options["top-k"]) if "top-k" in options else None
+        profiling = "profile" in options or "profile-output" in options
+        profiler = StageProfiler() if profiling else contextlib.nullcontext()
+        with profiler:
+            run_topsis(input_file, weights, impacts, output_file,
+                       chunksize=chunksize, top_k=top_k,
+                       dtype=options.get("dtype", "float64"),
+                       check_precision=options.get("check-precision", False))
+        if profiling:
+            # The timing report goes to stderr so stdout stays as before
+            if "profile-output" in options:
+                with open(options["profile-output"], "w") as f:
+                    f.write(profiler.to_json(indent=2) + "\n")
+            else:
+                print(profiler.to_json(indent=2), file=sys.stderr)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
 
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,241 @@
+"""Wall time and peak memory of the Sampling pipeline on synthetic data.
+
+Run from the ``Assignment02 - Sampling`` directory:
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --rows 1000,100000 --smoteenn-max-rows 100000
+    python benchmarks/bench_pipeline.py --preset full --save-baseline
+
+Each case builds an imbalanced dataset shaped like Creditcard_data.csv
+(Time, V1..V28, Amount, Class) and runs the pipeline stages one after
+another: oversampling, SMOTEENN (up to --smoteenn-max-rows), the sample
+size, apply_sampling_techniques and every technique x model fit. Each
+stage and fit records its wall time and the peak resident set size of the
+process while it ran. On Linux the peak is reset before each stage
+(/proc/self/clear_refs); elsewhere it is the process peak so far. Fits
+run one at a time in this process so they can be measured individually.
+Results are printed and written as JSON. With a baseline file present,
+stages slower than the baseline by more than the tolerance are reported
+as regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import warnings
+
+import imblearn
+import numpy as np
+import pandas as pd
+import sklearn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "baseline.json")
+
+PRESETS = {
+    "quick": [10 ** 3, 10 ** 4],
+    "default": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+    "full": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7],
+}
+
+# SMOTE needs a few neighbours within the minority class
+MIN_FRAUD_ROWS = 10
+
+
+def make_dataset(rows, fraud_rate, seed=0):
+    rng = np.random.default_rng(seed)
+    y = np.zeros(rows, dtype=np.int64)
+    y[rng.choice(rows, max(round(rows * fraud_rate), MIN_FRAUD_ROWS), replace=False)] = 1
+    features = rng.standard_normal((rows, 28))
+    # Fraud rows are shifted on a few components so that models can learn
+    features[y == 1, :4] += 2.0
+    data = pd.DataFrame(features, columns=[f"V{j}" for j in range(1, 29)])
+    data.insert(0, "Time", np.sort(rng.integers(0, 172_800, rows)).astype(float))
+    data["Amount"] = np.round(rng.exponential(88.0, rows), 2)
+    data["Class"] = y
+    return data
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(func, *args):
+    _reset_peak_rss()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    return result, {"seconds": seconds, "peak_rss_bytes": _peak_rss()}
+
+
+def run_case(rows, fraud_rate, smoteenn_max_rows):
+    data = make_dataset(rows, fraud_rate)
+    stages = {}
+
+    balanced, stages["balance_oversampling"] = measure(pipeline.balance_dataset, data, "oversampling")
+    if rows <= smoteenn_max_rows:
+        _, stages["balance_smoteenn"] = measure(pipeline.balance_dataset, data, "smoteenn")
+    del data
+
+    sample_size, stages["sample_size"] = measure(pipeline.calculate_sample_size, len(balanced))
+    samples, stages["apply_sampling_techniques"] = measure(
+        pipeline.apply_sampling_techniques, balanced, sample_size)
+    (X, y), stages["features"] = measure(
+        lambda: (balanced.drop(columns=["Class"]).to_numpy(), balanced["Class"].to_numpy()))
+    del balanced
+
+    fits = []
+    pipeline._set_data(X, y)
+    try:
+        for task in pipeline.build_tasks(samples):
+            record, timing = measure(pipeline.fit_and_score, task)
+            fits.append({
+                "technique": record["Sampling Technique"],
+                "model": record["Model"],
+                "accuracy": record["Accuracy"],
+                "rows": record["Rows"],
+                **timing,
+            })
+    finally:
+        pipeline._set_data(None, None)
+
+    return {
+        "rows": rows,
+        "balanced_rows": len(X),
+        "sample_size": sample_size,
+        "stages": stages,
+        "fits": fits,
+        "total_seconds": (sum(s["seconds"] for s in stages.values())
+                          + sum(f["seconds"] for f in fits)),
+    }
+
+
+def case_timings(case):
+    # Flat {name: timing} view of a case, for printing and comparison
+    timings = dict(case["stages"])
+    for fit in case["fits"]:
+        timings[f"fit {fit['technique']} / {fit['model']}"] = fit
+    return timings
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    old = {case["rows"]: case_timings(case) for case in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        previous = old.get(case["rows"])
+        if previous is None:
+            continue
+        for name, timing in case_timings(case).items():
+            before = previous.get(name, {}).get("seconds")
+            if (before and timing["seconds"] > before * tolerance
+                    and timing["seconds"] - before > min_seconds):
+                regressions.append({
+                    "rows": case["rows"],
+                    "stage": name,
+                    "baseline_seconds": before,
+                    "seconds": timing["seconds"],
+                    "ratio": timing["seconds"] / before,
+                })
+    return regressions
+
+
+def print_case(case):
+    print(f"{case['rows']} rows ({case['balanced_rows']} balanced)  "
+          f"total {case['total_seconds']:.3f}s")
+    for name, timing in case_timings(case).items():
+        print(f"  {name:<45} {timing['seconds']:9.4f}s  "
+              f"{timing['peak_rss_bytes'] / 2 ** 20:9.1f} MiB peak RSS")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    parser.add_argument("--rows", help="comma-separated row counts (overrides preset)")
+    parser.add_argument("--fraud-rate", type=float, default=0.0017,
+                        help="share of Class 1 rows (default: as in Creditcard_data.csv)")
+    parser.add_argument("--smoteenn-max-rows", type=float, default=2 * 10 ** 4,
+                        help="skip SMOTEENN above this many rows (it is slow on large inputs)")
+    parser.add_argument("--output", default=os.path.join(HERE, "results.json"))
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="report stages slower than baseline by this factor")
+    parser.add_argument("--min-seconds", type=float, default=0.01,
+                        help="ignore slowdowns smaller than this (timer noise)")
+    args = parser.parse_args(argv)
+
+    rows = PRESETS[args.preset]
+    if args.rows:
+        rows = [int(float(v)) for v in args.rows.split(",")]
+
+    results = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "imblearn": imblearn.__version__,
+        "machine": platform.machine(),
+        "peak_rss_per_stage": _reset_peak_rss(),
+        "cases": [],
+    }
+
+    with warnings.catch_warnings():
+        # Convergence warnings from the small fits would drown the report
+        warnings.simplefilter("ignore")
+        for n in rows:
+            case = run_case(n, args.fraud_rate, args.smoteenn_max_rows)
+            results["cases"].append(case)
+            print_case(case)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    status = 0
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance,
+                                  args.min_seconds)
+        if regressions:
+            status = 1
+            print(f"\n{len(regressions)} stage(s) slower than baseline x{args.tolerance}:")
+            for r in regressions:
+                print(f"  {r['rows']} rows, {r['stage']}: {r['baseline_seconds']:.4f}s -> "
+                      f"{r['seconds']:.4f}s (x{r['ratio']:.2f})")
+        else:
+            print("\nNo regressions against baseline.")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
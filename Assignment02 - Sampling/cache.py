@@ -0,0 +1,95 @@
+import hashlib
+import os
+import pickle
+
+CHUNK_BYTES = 1024 * 1024
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """Content-addressed on-disk cache for the pipeline's intermediate frames.
+
+    Entries are pickled (protocol 5) under the SHA-256 of their key, so a key
+    built from the input file's digest and the stage parameters changes -- and
+    the old entry is simply never read again -- whenever any input changes.
+    Reading an entry marks it as recently used; when the directory grows past
+    ``max_bytes`` the least recently used entries are deleted.
+    """
+
+    def __init__(self, directory=".cache", max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or unreadable entry: drop it and recompute
+            os.remove(path)
+            return None
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=5)
+        os.replace(tmp, path)
+        self.evict()
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                os.remove(entry.path)
+
+
+def cached(cache, key, compute):
+    # Computes directly when caching is disabled (cache is None)
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(key, compute)
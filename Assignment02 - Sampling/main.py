@@ -10,28 +10,63 @@ from sklearn.metrics import accuracy_score
 from imblearn.over_sampling import RandomOverSampler
 from imblearn.under_sampling import RandomUnderSampler
 from imblearn.combine import SMOTEENN
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import math
 import os
+import time
+
+from cache import DatasetCache, cached, file_digest
+from strata import Z_SCORES, StratumStats, neyman_allocation, stratum_stats
+from streaming import CHUNK_ROWS, stream_sampling_techniques
+
+DATASET_URL = "https://github.com/AnjulaMehto/Sampling_Assignment/raw/main/Creditcard_data.csv"
+DATASET_PATH = "Creditcard_data.csv"
+RANDOM_STATE = 42
+
+# Smallest training set used by the successive-halving search. Below about
+# this many rows a fit costs much the same whatever its size (model set-up
+# dominates), so smaller rungs would add fits without saving time.
+MIN_TRAIN_ROWS = 1000
+
+# Model name -> (class, constructor arguments); every task builds its own instance
+MODELS = {
+    "Logistic Regression": (LogisticRegression, {"max_iter": 1000}),
+    "Random Forest": (RandomForestClassifier, {}),
+    "SVM": (SVC, {}),
+    "Decision Tree": (DecisionTreeClassifier, {}),
+    "KNN": (KNeighborsClassifier, {}),
+}
 
 def download_dataset():
-    url = "https://github.com/AnjulaMehto/Sampling_Assignment/raw/main/Creditcard_data.csv"
-    dataset_path = "Creditcard_data.csv"
-    if not os.path.exists(dataset_path):
-        df = pd.read_csv(url)
-        df.to_csv(dataset_path, index=False)
+    if not os.path.exists(DATASET_PATH):
+        df = pd.read_csv(DATASET_URL)
+        df.to_csv(DATASET_PATH, index=False)
     else:
-        df = pd.read_csv(dataset_path)
+        df = pd.read_csv(DATASET_PATH)
     return df
 
+def load_dataset(cache=None):
+    # Returns the dataset and the hash of its file, which keys every later
+    # stage in the cache (None when caching is off)
+    if cache is None:
+        return download_dataset(), None
+    if not os.path.exists(DATASET_PATH):
+        df = download_dataset()
+        return df, file_digest(DATASET_PATH)
+    data_key = file_digest(DATASET_PATH)
+    return cache.get_or_compute(DatasetCache.key(data_key, "dataset"), download_dataset), data_key
+
 def balance_dataset(df, technique="oversampling"):
     X = df.drop(columns=["Class"])
     y = df["Class"]
 
     if technique == "oversampling":
-        sampler = RandomOverSampler(random_state=42)
+        sampler = RandomOverSampler(random_state=RANDOM_STATE)
     elif technique == "undersampling":
-        sampler = RandomUnderSampler(random_state=42)
+        sampler = RandomUnderSampler(random_state=RANDOM_STATE)
     elif technique == "smoteenn":
-        sampler = SMOTEENN(random_state=42)
+        sampler = SMOTEENN(random_state=RANDOM_STATE)
     else:
         raise ValueError("Unsupported balancing technique")
 
@@ -39,83 +74,297 @@ def balance_dataset(df, technique="oversampling"):
     return pd.DataFrame(X_resampled, columns=X.columns).assign(Class=y_resampled)
 
 def calculate_sample_size(population_size, confidence_level=0.95, margin_of_error=0.05):
-    Z = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576}[confidence_level]
+    Z = Z_SCORES[confidence_level]
     p = 0.5  # Assume 50% population proportion for maximum variability
     n = (Z**2 * p * (1 - p)) / margin_of_error**2
     return int(min(n, population_size))
 
-def apply_sampling_techniques(df, sample_size):
-    techniques = {}
-    # Simple Random Sampling
-    techniques["Simple Random"] = df.sample(n=sample_size, random_state=42)
+# Each technique returns the row positions of its sample in df; the rows
+# themselves are only gathered when a model is fitted (see fit_and_score).
+# Draws follow the same random streams as DataFrame.sample and
+# GroupBy.sample with random_state=RANDOM_STATE.
+
+def simple_random_sample(df, sample_size):
+    rng = np.random.RandomState(RANDOM_STATE)
+    return rng.choice(len(df), size=sample_size, replace=False)
 
-    # Systematic Sampling
+def systematic_sample(df, sample_size):
     step = len(df) // sample_size
-    techniques["Systematic"] = df.iloc[::step].head(sample_size)
+    return np.arange(0, len(df), step)[:sample_size]
 
-    # Stratified Sampling
-    techniques["Stratified"] = df.groupby("Class", group_keys=False).apply(
-        lambda x: x.sample(min(len(x), sample_size // 2), random_state=42))
+def stratified_sample(df, sample_size, sizes=None):
+    # sizes: per-class sample sizes (see strata.neyman_allocation),
+    # otherwise sample_size // 2 from every class
+    classes = df["Class"].to_numpy()
+    parts = []
+    for value in np.unique(classes):
+        positions = np.flatnonzero(classes == value)
+        rng = np.random.RandomState(RANDOM_STATE)
+        size = min(len(positions), sizes[value] if sizes else sample_size // 2)
+        parts.append(positions[rng.choice(len(positions), size=size, replace=False)])
+    return np.concatenate(parts)
 
-    # Cluster Sampling (use Time column to create clusters)
-    df["Cluster"] = pd.qcut(df["Time"], q=sample_size, labels=False)
-    cluster_sample = df.groupby("Cluster").sample(n=1, random_state=42)
-    techniques["Cluster"] = cluster_sample.drop(columns=["Cluster"])
+def cluster_sample(df, sample_size):
+    # Use Time column to create clusters; repeated Time values can merge
+    # quantile edges, giving fewer than sample_size clusters
+    clusters = pd.qcut(df["Time"], q=sample_size, labels=False, duplicates="drop").to_numpy()
+    order = np.argsort(clusters, kind="stable")
+    sizes = np.bincount(clusters)
+    rng = np.random.RandomState(RANDOM_STATE)
+    picks = [group[rng.choice(len(group), size=1, replace=False)]
+             for group in np.split(order, np.cumsum(sizes)[:-1]) if len(group)]
+    return np.concatenate(picks)
 
-    # Oversampling (already balanced, can be added as an example)
-    techniques["Oversampling"] = balance_dataset(df, technique="oversampling").sample(n=sample_size, random_state=42)
+def oversampling_sample(df, sample_size):
+    # df is already the oversampled dataset (see main); oversampling it again
+    # adds no rows, so this is a random sample of it
+    return simple_random_sample(df, sample_size)
 
+SAMPLING_TECHNIQUES = {
+    "Simple Random": simple_random_sample,
+    "Systematic": systematic_sample,
+    "Stratified": stratified_sample,
+    "Cluster": cluster_sample,
+    "Oversampling": oversampling_sample,
+}
+
+def apply_sampling_techniques(df, sample_size, cache=None, data_key=None, allocation=None):
+    # data_key identifies df in the cache (see main); each technique is cached
+    # separately. allocation gives per-class sizes for the stratified sample.
+    techniques = {}
+    for name, technique in SAMPLING_TECHNIQUES.items():
+        params = {"sizes": allocation} if name == "Stratified" and allocation else {}
+        key = DatasetCache.key(data_key, "sample-index", name, sample_size, RANDOM_STATE,
+                               sorted(params.get("sizes", {}).items()))
+        techniques[name] = cached(cache, key, lambda: technique(df, sample_size, **params))
     return techniques
 
 
-def train_models(samples):
-    models = {
-        "Logistic Regression": LogisticRegression(max_iter=1000),
-        "Random Forest": RandomForestClassifier(),
-        "SVM": SVC(),
-        "Decision Tree": DecisionTreeClassifier(),
-        "KNN": KNeighborsClassifier()
+# Feature matrix and labels shared by every task in a process
+_X = _y = None
+
+def _set_data(X, y):
+    global _X, _y
+    _X, _y = X, y
+
+def fit_and_score(task):
+    technique_name, model_name, train_index, test_index = task
+    model_class, params = MODELS[model_name]
+
+    start = time.perf_counter()
+    if len(np.unique(_y[train_index])) < 2:
+        # Unbalanced samples (--stream) may hold no fraud rows at all; most
+        # models cannot be fitted on one class, so the cell is left empty
+        accuracy = float("nan")
+    else:
+        model = model_class(**params)
+        model.fit(_X[train_index], _y[train_index])
+        accuracy = accuracy_score(_y[test_index], model.predict(_X[test_index]))
+    return {
+        "Sampling Technique": technique_name,
+        "Model": model_name,
+        "Accuracy": accuracy,
+        "Seconds": time.perf_counter() - start,
+        "Rows": len(train_index),
     }
 
-    results_matrix = pd.DataFrame(
-        columns=["Sampling Technique", "Model", "Accuracy"]
-    )
 
-    for technique_name, sample in samples.items():
-        X = sample.drop(columns=["Class"])
-        y = sample["Class"]
+def rung_rows(n_train, train_fraction):
+    # Training rows of a cell fitted on train_fraction of an n_train split
+    if train_fraction >= 1:
+        return n_train
+    return min(n_train, max(math.ceil(train_fraction * n_train), MIN_TRAIN_ROWS))
 
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-        for model_name, model in models.items():
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
+def stratified_subsample(train_index, labels, rows):
+    # rows positions of train_index with each class in proportion (at least
+    # one row per class), taken from the front of the already shuffled split
+    classes, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    take = np.maximum(1, counts * rows // len(labels))
+    take[np.argmax(counts)] += rows - take.sum()
+    keep = np.concatenate([np.flatnonzero(inverse == i)[:k] for i, k in enumerate(take)])
+    return train_index[np.sort(keep)]
 
-            # Append results to the matrix
-            results_matrix = results_matrix.append({
-                "Sampling Technique": technique_name,
-                "Model": model_name,
-                "Accuracy": accuracy
-            }, ignore_index=True)
 
-    return results_matrix
+def build_tasks(samples, cells=None, train_fraction=1.0, y=None):
+    # One fit_and_score task per (technique, model) cell. cells limits the
+    # run to some pairs, and train_fraction fits on that share of each
+    # training split (the test split is always used in full), stratified
+    # by the labels y when given.
+    if cells is None:
+        cells = [(technique_name, model_name) for technique_name in samples for model_name in MODELS]
 
-def main():
-    df = download_dataset()
-    balanced_df = balance_dataset(df, technique="oversampling")
-    sample_size = calculate_sample_size(len(balanced_df))
+    splits = {}
+    tasks = []
+    for technique_name, model_name in cells:
+        if technique_name not in splits:
+            splits[technique_name] = train_test_split(
+                samples[technique_name], test_size=0.2, random_state=RANDOM_STATE)
+        train_index, test_index = splits[technique_name]
+        rows = rung_rows(len(train_index), train_fraction)
+        if rows < len(train_index):
+            if y is None:
+                # The split is shuffled, so a prefix is a random subsample
+                train_index = train_index[:rows]
+            else:
+                train_index = stratified_subsample(train_index, y[train_index], rows)
+        tasks.append((technique_name, model_name, train_index, test_index))
+    return tasks
 
-    print(f"Calculated Sample Size: {sample_size}")
-    samples = apply_sampling_techniques(balanced_df, sample_size)
-    results_matrix = train_models(samples)
 
+def train_models(df, samples, workers=None, cells=None, train_fraction=1.0):
+    # samples maps technique -> row positions in df (apply_sampling_techniques);
+    # cells and train_fraction as in build_tasks. workers=1 runs in this process.
+    X = df.drop(columns=["Class"]).to_numpy()
+    y = df["Class"].to_numpy()
+    tasks = build_tasks(samples, cells, train_fraction, y)
+
+    if workers == 1:
+        _set_data(X, y)
+        try:
+            records = [fit_and_score(task) for task in tasks]
+        finally:
+            _set_data(None, None)
+    else:
+        # The arrays reach each worker once, not once per task
+        with ProcessPoolExecutor(max_workers=workers, initializer=_set_data,
+                                 initargs=(X, y)) as pool:
+            records = list(pool.map(fit_and_score, tasks))
+
+    return pd.DataFrame.from_records(
+        records, columns=["Sampling Technique", "Model", "Accuracy", "Seconds", "Rows"]
+    )
+
+def successive_halving(df, samples, workers=None, eta=3, rungs=3):
+    # Every cell is first fitted on 1/eta**(rungs - 1) of its training split
+    # (at least MIN_TRAIN_ROWS rows); after each rung only the best 1/eta of
+    # the cells (by accuracy) go on to a training set eta times larger, the
+    # last rung using all of it. A cell whose rows would not change is not
+    # refitted, so splits too small to subsample cost one fit each, as in a
+    # full run. A cell's row keeps its last accuracy; Seconds adds up all
+    # its fits.
+    cells = [(technique_name, model_name) for technique_name in samples for model_name in MODELS]
+    train_rows = {name: len(index) - math.ceil(0.2 * len(index)) for name, index in samples.items()}
+    results = {}
+    fitted_rows = {}
+    for rung in range(rungs):
+        fraction = eta ** (rung - rungs + 1)
+        rows = {cell: rung_rows(train_rows[cell[0]], fraction) for cell in cells}
+        refit = [cell for cell in cells if fitted_rows.get(cell) != rows[cell]]
+        if refit:
+            rung_results = train_models(df, samples, workers, refit, train_fraction=fraction)
+            for record in rung_results.to_dict("records"):
+                cell = (record["Sampling Technique"], record["Model"])
+                if cell in results:
+                    record["Seconds"] += results[cell]["Seconds"]
+                results[cell] = record
+                fitted_rows[cell] = rows[cell]
+        for cell in cells:
+            results[cell]["Rung"] = rung
+
+        if rung < rungs - 1:
+            # Best first, ties in cell order, empty (NaN) cells last
+            accuracy = {cell: results[cell]["Accuracy"] for cell in cells}
+            ranked = sorted(cells, key=lambda cell: (np.isnan(accuracy[cell]),
+                                                     -np.nan_to_num(accuracy[cell])))
+            cells = ranked[:math.ceil(len(ranked) / eta)]
+
+    return pd.DataFrame.from_records(
+        list(results.values()),
+        columns=["Sampling Technique", "Model", "Accuracy", "Seconds", "Rows", "Rung"],
+    )
+
+def report(results_matrix):
     # Display the results in a matrix format
     pivot_table = results_matrix.pivot(
         index="Model", columns="Sampling Technique", values="Accuracy"
     )
     print("\nResults Matrix:")
     print(pivot_table.round(2))  # Round to 2 decimal places for clarity
+    empty = results_matrix["Accuracy"].isna().sum()
+    if empty:
+        print(f"({empty} cell(s) left empty: their training split holds one class only)")
+
+    # Slowest cells first
+    print("\nTask Timings (seconds):")
+    timings = results_matrix.sort_values("Seconds", ascending=False)
+    columns = ["Sampling Technique", "Model", "Seconds", "Rows"]
+    if "Rung" in timings:
+        columns.append("Rung")
+    print(timings[columns].round(3).to_string(index=False))
+    print(f"Total fit time: {results_matrix['Seconds'].sum():.2f}s")
+
+def evaluate(df, samples, args):
+    if args.halving:
+        return successive_halving(df, samples, args.workers, args.eta, args.rungs)
+    return train_models(df, samples, workers=args.workers)
+
+def allocate(stats, args):
+    allocation = neyman_allocation(stats, args.confidence, args.margin)
+    print(f"Neyman Allocation ({args.target} mean within {args.margin:.0%}): {allocation}")
+    return allocation
+
+def main_streaming(args):
+    # The file is never held in memory, so it is sampled as it is (not balanced)
+    sample_size = calculate_sample_size(float("inf"))
+    print(f"Calculated Sample Size: {sample_size}")
+    allocation = None
+    if args.allocation == "neyman":
+        # A separate (cheap) pass: the sizes must be known before sampling
+        allocation = allocate(stratum_stats(args.stream, args.target, chunksize=args.chunksize), args)
+    base, samples = stream_sampling_techniques(args.stream, sample_size, args.chunksize,
+                                               RANDOM_STATE, allocation)
+    report(evaluate(base, samples, args))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sampling techniques across models.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for model training (default: one per CPU, 1 = no pool)")
+    parser.add_argument("--cache-dir", default=".cache",
+                        help="directory for cached datasets and samples (default: .cache)")
+    parser.add_argument("--cache-size", type=int, default=512,
+                        help="cache size limit in MB; least recently used entries go first")
+    parser.add_argument("--no-cache", action="store_true", help="recompute every stage")
+    parser.add_argument("--allocation", choices=["equal", "neyman"], default="equal",
+                        help="per-class sizes of the stratified sample (default: equal halves)")
+    parser.add_argument("--target", default="Amount",
+                        help="column whose mean the Neyman allocation estimates (default: Amount)")
+    parser.add_argument("--margin", type=float, default=0.05,
+                        help="Neyman margin of error, relative to the target mean (default: 0.05)")
+    parser.add_argument("--confidence", type=float, default=0.95, choices=sorted(Z_SCORES),
+                        help="confidence level of the margin of error (default: 0.95)")
+    parser.add_argument("--halving", action="store_true",
+                        help="successive-halving search instead of fitting every cell in full")
+    parser.add_argument("--eta", type=int, default=3,
+                        help="halving rate: keep 1/eta of the cells per rung (default: 3)")
+    parser.add_argument("--rungs", type=int, default=3, help="number of halving rungs (default: 3)")
+    parser.add_argument("--stream", metavar="CSV",
+                        help="sample CSV in one chunked pass instead of loading it (no balancing)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS,
+                        help=f"rows per chunk with --stream (default: {CHUNK_ROWS})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.stream:
+        return main_streaming(args)
+    cache = None if args.no_cache else DatasetCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    # Stage keys chain from the dataset's content hash, so editing the CSV
+    # invalidates everything downstream of it
+    df, data_key = load_dataset(cache)
+    balanced_key = DatasetCache.key(data_key, "balance", "oversampling", RANDOM_STATE)
+    balanced_df = cached(cache, balanced_key, lambda: balance_dataset(df, technique="oversampling"))
+    sample_size = calculate_sample_size(len(balanced_df))
+
+    print(f"Calculated Sample Size: {sample_size}")
+    allocation = None
+    if args.allocation == "neyman":
+        stats = StratumStats(args.target)
+        stats.update(balanced_df)
+        allocation = allocate(stats, args)
+    samples = apply_sampling_techniques(balanced_df, sample_size, cache, balanced_key, allocation)
+    report(evaluate(balanced_df, samples, args))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
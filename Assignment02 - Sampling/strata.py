@@ -0,0 +1,106 @@
+"""Per-stratum statistics and Neyman allocation of a stratified sample.
+
+``StratumStats`` keeps the count, mean and sum of squared deviations of a
+target column for each stratum. Chunks (or whole partial states from other
+processes) are combined with Chan et al.'s pairwise update, so the
+statistics of a file can be built in one chunked pass.
+
+``neyman_allocation`` turns them into per-stratum sample sizes: the
+smallest total sample whose stratified mean of the target has the
+requested margin of error, split in proportion to N_h * S_h.
+"""
+import math
+
+import pandas as pd
+
+Z_SCORES = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576}
+
+
+class StratumStats:
+    def __init__(self, column="Amount", by="Class"):
+        self.column = column
+        self.by = by
+        # Stratum -> (count, mean, sum of squared deviations)
+        self.strata = {}
+
+    def update(self, chunk):
+        grouped = chunk.groupby(self.by)[self.column]
+        counts, means = grouped.count(), grouped.mean()
+        m2 = grouped.var(ddof=0) * counts
+        for stratum in counts.index:
+            self._add(stratum, int(counts[stratum]), float(means[stratum]), float(m2[stratum]))
+
+    def merge(self, other):
+        for stratum, state in other.strata.items():
+            self._add(stratum, *state)
+        return self
+
+    def _add(self, stratum, n_b, mean_b, m2_b):
+        if n_b == 0:
+            return
+        n_a, mean_a, m2_a = self.strata.get(stratum, (0, 0.0, 0.0))
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        self.strata[stratum] = (
+            n,
+            mean_a + delta * n_b / n,
+            m2_a + m2_b + delta * delta * n_a * n_b / n,
+        )
+
+    def count(self, stratum):
+        return self.strata[stratum][0]
+
+    def mean(self, stratum=None):
+        if stratum is not None:
+            return self.strata[stratum][1]
+        total = sum(n for n, _, _ in self.strata.values())
+        return sum(n * mean for n, mean, _ in self.strata.values()) / total
+
+    def std(self, stratum):
+        n, _, m2 = self.strata[stratum]
+        return math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+
+
+def stratum_stats(path, column="Amount", by="Class", chunksize=100_000):
+    stats = StratumStats(column, by)
+    for chunk in pd.read_csv(path, usecols=[column, by], chunksize=chunksize):
+        stats.update(chunk)
+    if not stats.strata:
+        raise ValueError("Input file contains no rows.")
+    return stats
+
+
+def neyman_allocation(stats, confidence_level=0.95, margin_of_error=0.05, min_per_stratum=2):
+    """Return {stratum: sample size} under Neyman allocation.
+
+    ``margin_of_error`` is relative to the population mean of the target
+    (0.05 = +/-5%). Strata whose share would exceed their size are taken
+    in full and the rest is re-allocated among the others.
+    """
+    Z = Z_SCORES[confidence_level]
+    N = sum(stats.count(h) for h in stats.strata)
+    # Target variance of the stratified estimate of the mean
+    V = (margin_of_error * abs(stats.mean()) / Z) ** 2
+
+    sizes = {}
+    remaining = set(stats.strata)
+    while remaining:
+        weight = {h: stats.count(h) / N * stats.std(h) for h in remaining}
+        total_weight = sum(weight.values())
+        if total_weight == 0:
+            # No spread left to estimate: the minimum per stratum will do
+            sizes.update((h, 0) for h in remaining)
+            break
+        correction = sum(weight[h] * stats.std(h) / N for h in remaining)
+        n = total_weight ** 2 / (V + correction) if V + correction else math.inf
+
+        census = {h for h in remaining if n * weight[h] / total_weight >= stats.count(h)}
+        if not census:
+            for h in remaining:
+                sizes[h] = math.ceil(n * weight[h] / total_weight)
+            break
+        for h in census:
+            sizes[h] = stats.count(h)
+        remaining -= census
+
+    return {h: min(stats.count(h), max(sizes[h], min_per_stratum)) for h in sorted(sizes)}
@@ -0,0 +1,214 @@
+"""Single-pass sampling of CSV files too large to load at once.
+
+The file is read once with a chunked reader, and every sampler sees each
+chunk as it goes by, so memory depends on the sample and chunk sizes and
+not on the length of the file. The samplers follow the in-memory
+techniques in main.py:
+
+* Simple Random: the rows with the ``sample_size`` smallest random keys,
+  which is a uniform sample without replacement (reservoir sampling).
+* Systematic: every ``step``-th row. The length of the file is not known
+  until the end, so every row is held at first and the held step doubles
+  whenever more than ``2 * sample_size`` rows are held. At the end, the
+  held row nearest to each of ``sample_size`` positions spaced evenly over
+  the whole file is taken, so the sample covers the file as the in-memory
+  one does (each row within half a held step of its ideal position).
+* Stratified: a separate reservoir per Class, of ``sample_size // 2`` rows
+  or of the class's size in a given allocation.
+* Cluster: rows are bucketed by ``Time``. Adjacent buckets are merged
+  to keep a bounded number of fine buckets with roughly equal counts.
+  At the end they are merged into ``sample_size`` approximate quantile
+  clusters.
+  Each bucket keeps its row with the smallest random key, so the row
+  drawn from a cluster is uniform within it.
+
+Each sampler (and each class reservoir of the stratified one) draws its
+random keys from its own stream, spawned from ``random_state``; with one
+seed shared, a row would get the same key everywhere and the samples
+would overlap far more than independent ones. Sampled rows keep their
+position in the file as their index.
+"""
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 100_000
+
+# Cluster sampling tracks this many Time buckets per final cluster, so the
+# cluster edges land within about 1/16 of a cluster of the true quantiles
+BUCKETS_PER_CLUSTER = 16
+
+
+def _seed_sequence(random_state):
+    if isinstance(random_state, np.random.SeedSequence):
+        return random_state
+    return np.random.SeedSequence(random_state)
+
+
+class ReservoirSampler:
+    def __init__(self, sample_size, random_state=42):
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(random_state)
+        self.rows = None
+        self.keys = np.empty(0)
+
+    def update(self, chunk):
+        keys = self.rng.random(len(chunk))
+        if len(self.keys) == self.sample_size:
+            # Only rows that beat the current k-th smallest key can enter
+            mask = keys < self.keys.max()
+            chunk, keys = chunk[mask], keys[mask]
+        rows = chunk if self.rows is None else pd.concat([self.rows, chunk])
+        keys = np.concatenate([self.keys, keys])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size - 1)[:self.sample_size]
+            rows, keys = rows.iloc[keep], keys[keep]
+        self.rows, self.keys = rows, keys
+
+    def result(self):
+        return self.rows.iloc[np.argsort(self.keys, kind="stable")]
+
+
+class SystematicSampler:
+    def __init__(self, sample_size):
+        self.sample_size = sample_size
+        self.step = 1
+        self.n_rows = 0
+        self.parts = []
+
+    def update(self, chunk):
+        positions = np.arange(self.n_rows, self.n_rows + len(chunk))
+        self.n_rows += len(chunk)
+        self.parts.append(chunk[positions % self.step == 0])
+        if sum(len(p) for p in self.parts) > 2 * self.sample_size:
+            rows = pd.concat(self.parts)
+            while len(rows) > 2 * self.sample_size:
+                self.step *= 2
+                rows = rows[rows.index % self.step == 0]
+            self.parts = [rows]
+
+    def result(self):
+        # The held rows are rows 0, step, 2 * step, ... of the file
+        rows = pd.concat(self.parts)
+        if len(rows) <= self.sample_size:
+            return rows
+        # More than sample_size are held, so the targets are at least a held
+        # step apart and round to distinct rows
+        targets = np.arange(self.sample_size) * (self.n_rows / self.sample_size)
+        picks = np.minimum(np.rint(targets / self.step).astype(np.int64), len(rows) - 1)
+        return rows.iloc[picks]
+
+
+class StratifiedSampler:
+    def __init__(self, sample_size, random_state=42, column="Class", sizes=None):
+        # sizes: per-class sample sizes (see strata.neyman_allocation),
+        # otherwise sample_size // 2 from every class
+        self.per_class = sample_size // 2
+        self.sizes = sizes or {}
+        self.seed = _seed_sequence(random_state)
+        self.column = column
+        self.reservoirs = {}
+
+    def update(self, chunk):
+        for value, group in chunk.groupby(self.column):
+            if value not in self.reservoirs:
+                size = self.sizes.get(value, self.per_class)
+                # A stream per class, spawned in the order the classes appear
+                self.reservoirs[value] = ReservoirSampler(size, self.seed.spawn(1)[0])
+            self.reservoirs[value].update(group)
+
+    def result(self):
+        return pd.concat([self.reservoirs[v].result() for v in sorted(self.reservoirs)])
+
+
+class ClusterSampler:
+    def __init__(self, sample_size, random_state=42, column="Time"):
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(random_state)
+        self.column = column
+        # Buckets are the intervals [low[i], low[i + 1]), the last one ending
+        # at the largest value seen; each keeps its count, smallest key and
+        # the row holding that key
+        self.low = self.keys = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.rows = None
+        self.max_value = -np.inf
+
+    def update(self, chunk):
+        values = chunk[self.column].to_numpy(dtype=float)
+        keys = self.rng.random(len(chunk))
+
+        # A bucket per distinct value in the chunk ...
+        order = np.lexsort((keys, values))
+        unique, starts = np.unique(values[order], return_index=True)
+        first = order[starts]
+        counts = np.diff(np.append(starts, len(values)))
+
+        # ... folded into the existing bucket whose interval holds it
+        low = unique.copy()
+        if len(self.low):
+            idx = np.searchsorted(self.low, unique, side="right") - 1
+            inside = (idx >= 0) & (unique <= self.max_value)
+            low[inside] = self.low[idx[inside]]
+        self.max_value = max(self.max_value, unique[-1]) if len(unique) else self.max_value
+
+        rows = chunk.iloc[first]
+        self.rows = rows if self.rows is None else pd.concat([self.rows, rows])
+        self.low = np.concatenate([self.low, low])
+        self.counts = np.concatenate([self.counts, counts])
+        self.keys = np.concatenate([self.keys, keys[first]])
+
+        order = np.argsort(self.low, kind="stable")
+        self._reduce(order, np.cumsum(np.diff(self.low[order], prepend=np.nan) != 0))
+        if len(self.low) > 2 * BUCKETS_PER_CLUSTER * self.sample_size:
+            self._partition(BUCKETS_PER_CLUSTER * self.sample_size)
+
+    def _partition(self, n_buckets):
+        # Adjacent buckets starting in the same 1/n_buckets of the rows merge
+        before = np.cumsum(self.counts) - self.counts
+        self._reduce(np.arange(len(self.low)), before * n_buckets // self.counts.sum())
+
+    def _reduce(self, order, group):
+        # Merge the buckets taken in the given order into runs of equal group
+        low, counts, keys = self.low[order], self.counts[order], self.keys[order]
+        starts = np.flatnonzero(np.diff(group, prepend=-1))
+        best = np.lexsort((keys, group))[starts]
+        self.low = low[starts]
+        self.counts = np.add.reduceat(counts, starts)
+        self.keys = keys[best]
+        self.rows = self.rows.iloc[order[best]]
+
+    def result(self):
+        self._partition(self.sample_size)
+        return self.rows
+
+
+def stream_sampling_techniques(path, sample_size, chunksize=CHUNK_ROWS, random_state=42,
+                               allocation=None):
+    """Draw every streaming sample from ``path`` in one pass.
+
+    Returns ``(base, samples)`` in the shape ``train_models`` takes: a frame
+    holding each sampled row once (indexed by its position in the file) and,
+    per technique, the positions of its rows in that frame. ``allocation``
+    gives per-class sizes for the stratified sample.
+    """
+    simple_seed, stratified_seed, cluster_seed = _seed_sequence(random_state).spawn(3)
+    samplers = {
+        "Simple Random": ReservoirSampler(sample_size, simple_seed),
+        "Systematic": SystematicSampler(sample_size),
+        "Stratified": StratifiedSampler(sample_size, stratified_seed, sizes=allocation),
+        "Cluster": ClusterSampler(sample_size, cluster_seed),
+    }
+
+    n_rows = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        n_rows += len(chunk)
+        for sampler in samplers.values():
+            sampler.update(chunk)
+    if n_rows == 0:
+        raise ValueError("Input file contains no rows.")
+
+    frames = {name: sampler.result() for name, sampler in samplers.items()}
+    base = pd.concat(frames.values())
+    base = base[~base.index.duplicated()].sort_index()
+    samples = {name: base.index.get_indexer(frame.index) for name, frame in frames.items()}
+    return base, samples
@@ -1,46 +1,210 @@
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 
 # -------------------------------
-# 1. Load dataset
+# Fixed roll-number parameters
 # -------------------------------
-# Update path if needed
-df = pd.read_csv("data.csv")
+Ar = 0.15
+br = 0.6
+
+# Rows per chunk when reading the file in one process
+CHUNK_ROWS = 1_000_000
+
+# Bytes per block when each worker process reads its own part of the file
+BLOCK_BYTES = 64 * 1024 * 1024
+
+# Cap on the (Ar, br) x samples intermediates of a grid evaluation
+GRID_BYTES = 256 * 1024 * 1024
 
-# Extract NO2 feature (drop missing values)
-x = df["NO2"].dropna().values
 
 # -------------------------------
-# 2. Fixed roll-number parameters
+# Transformation (Step-1)
 # -------------------------------
-Ar = 0.15
-br = 0.6
+def transform(x, Ar=Ar, br=br):
+    return x + Ar * np.sin(br * x)
+
 
 # -------------------------------
-# 3. Transformation (Step-1)
+# Running moments of z
 # -------------------------------
-z = x + Ar * np.sin(br * x)
+# A partial state is (count, mean, sum of squared deviations from the mean).
+# States of consecutive chunks, or of parts read by different processes,
+# merge exactly (Chan et al.), so the file never has to be in memory. For a
+# grid of parameters, mean and M2 are arrays with one entry per (Ar, br).
+EMPTY = (0, 0.0, 0.0)
+
+
+def moments(z):
+    # Reduces over the last axis (the samples)
+    if z.shape[-1] == 0:
+        return EMPTY
+    mean = z.mean(axis=-1)
+    return z.shape[-1], mean, ((z - mean[..., None]) ** 2).sum(axis=-1)
+
+
+def merge(a, b):
+    (n_a, mean_a, m2_a), (n_b, mean_b, m2_b) = a, b
+    if n_a == 0:
+        return b
+    if n_b == 0:
+        return a
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+
+def grid_moments(x, Ar=Ar, br=br, max_bytes=GRID_BYTES):
+    """Moments of z for every pair of the ``Ar`` and ``br`` values.
+
+    z is evaluated by broadcasting to an (Ar, br, sample) array, a slice of
+    the samples at a time, so that about three such arrays (z and the
+    temporaries around it) stay under ``max_bytes``. Scalars give a 0-d
+    result, one-dimensional grids a (len(Ar), len(br)) one.
+    """
+    Ar, br = np.asarray(Ar, dtype=float), np.asarray(br, dtype=float)
+    shape = Ar.shape + br.shape
+    Ar = Ar.reshape(-1, 1, 1)
+    br = br.reshape(1, -1, 1)
+    step = max(1, max_bytes // (3 * 8 * Ar.size * br.size))
+
+    state = EMPTY
+    for start in range(0, len(x), step):
+        state = merge(state, moments(transform(x[start:start + step], Ar, br)))
+    if state is EMPTY:
+        return state
+    n, mean, m2 = state
+    return n, mean.reshape(shape), m2.reshape(shape)
+
 
 # -------------------------------
-# 4. Parameter estimation (Step-2)
+# Parameter estimation (Step-2)
 # -------------------------------
+def parameters(state):
+    n, mu, m2 = state
+    if n == 0:
+        raise ValueError("No values to estimate from.")
 
-# Mean (mu)
-mu = np.mean(z)
+    # Variance (MLE version, divide by n)
+    variance = m2 / n
 
-# Variance (MLE version, divide by n)
-variance = np.mean((z - mu) ** 2)
+    # Lambda
+    lam = 1 / (2 * variance)
 
-# Lambda
-lam = 1 / (2 * variance)
+    # Normalization constant c
+    c = np.sqrt(lam / np.pi)
+    return mu, variance, lam, c
 
-# Normalization constant c
-c = np.sqrt(lam / np.pi)
 
 # -------------------------------
-# 5. Output results
+# Reading the NO2 column in chunks
 # -------------------------------
-print("Estimated parameters:")
-print(f"mu (μ)     = {mu}")
-print(f"lambda (λ) = {lam}")
-print(f"c          = {c}")
+def _values(frame, column):
+    # NO2 feature, missing values dropped
+    return frame[column].dropna().to_numpy(dtype=float)
+
+
+def _byte_ranges(path, parts):
+    # Split the body of the file into parts that start at line boundaries
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        bounds = [f.tell()]
+        for i in range(1, parts):
+            f.seek(max(bounds[-1], size * i // parts - 1))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+        bounds.append(size)
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop]
+
+
+def _range_moments(args):
+    # Assumes no line breaks inside quoted fields
+    path, start, stop, names, column, Ar, br, max_bytes = args
+    state = EMPTY
+    with open(path, "rb") as f:
+        f.seek(start)
+        while f.tell() < stop:
+            block = f.read(min(BLOCK_BYTES, stop - f.tell()))
+            if f.tell() < stop:
+                block += f.readline()
+            frame = pd.read_csv(io.BytesIO(block), header=None, names=names, usecols=[column])
+            state = merge(state, grid_moments(_values(frame, column), Ar, br, max_bytes))
+    return state
+
+
+def estimate(path, column="NO2", Ar=Ar, br=br, chunksize=CHUNK_ROWS, workers=1,
+             max_bytes=GRID_BYTES):
+    """Moments of z = x + Ar*sin(br*x) over a CSV column, read in chunks.
+
+    ``Ar`` and ``br`` may be sequences: every pair is then evaluated in the
+    same pass (see ``grid_moments``). With ``workers`` > 1 the file is split
+    into byte ranges read by separate processes, and their partial states
+    are merged in file order.
+    """
+    if workers == 1:
+        state = EMPTY
+        for chunk in pd.read_csv(path, usecols=[column], chunksize=chunksize):
+            state = merge(state, grid_moments(_values(chunk, column), Ar, br, max_bytes))
+        return state
+
+    names = list(pd.read_csv(path, nrows=0).columns)
+    tasks = [(path, start, stop, names, column, Ar, br, max_bytes)
+             for start, stop in _byte_ranges(path, workers)]
+    state = EMPTY
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_range_moments, tasks):
+            state = merge(state, part)
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate the PDF parameters of transformed NO2.")
+    # Update path if needed
+    parser.add_argument("path", nargs="?", default="data.csv")
+    parser.add_argument("--column", default="NO2")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS,
+                        help="rows read at a time (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes reading separate parts of the file (default: 1)")
+    parser.add_argument("--ar", help="comma-separated Ar values to compare (default: roll-number Ar)")
+    parser.add_argument("--br", help="comma-separated br values to compare (default: roll-number br)")
+    parser.add_argument("--max-mb", type=float, default=GRID_BYTES / 2 ** 20,
+                        help="memory cap for the grid evaluation in MiB (default: %(default)s)")
+    parser.add_argument("--output", help="also write the grid results to this CSV file")
+    args = parser.parse_args(argv)
+
+    if args.ar or args.br:
+        # Grid mode: one row per (Ar, br) pair
+        Ar_values = [float(v) for v in args.ar.split(",")] if args.ar else [Ar]
+        br_values = [float(v) for v in args.br.split(",")] if args.br else [br]
+        state = estimate(args.path, args.column, Ar_values, br_values, args.chunksize,
+                         args.workers, int(args.max_mb * 2 ** 20))
+        mu, variance, lam, c = parameters(state)
+        Ar_grid, br_grid = np.meshgrid(Ar_values, br_values, indexing="ij")
+        results = pd.DataFrame({"Ar": Ar_grid.ravel(), "br": br_grid.ravel(), "mu": mu.ravel(),
+                                "lambda": lam.ravel(), "c": c.ravel()})
+        print("Estimated parameters:")
+        print(results.to_string(index=False))
+        if args.output:
+            results.to_csv(args.output, index=False)
+        return
+
+    state = estimate(args.path, args.column, chunksize=args.chunksize, workers=args.workers)
+    mu, variance, lam, c = parameters(state)
+
+    # -------------------------------
+    # Output results
+    # -------------------------------
+    print("Estimated parameters:")
+    print(f"mu (μ)     = {mu}")
+    print(f"lambda (λ) = {lam}")
+    print(f"c          = {c}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,11 +11,13 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.preprocessing import StandardScaler
-from sklearn.neighbors import KernelDensity
 import torch
 import torch.nn as nn
 import torch.optim as optim
 
+from fft_kde import kde_fft
+from gan_ensemble import train_gan_ensemble
+
 r = 102303806
 a_r = 0.5 * (r % 7)
 b_r = 0.3 * (r % 5 + 1)
@@ -102,9 +104,9 @@ with torch.no_grad():
 
 z_f = scaler.inverse_transform(z_f)
 
-kde = KernelDensity(kernel="gaussian", bandwidth=1.0).fit(z_f)
+# Gaussian KDE, bandwidth 1.0 (binned + FFT, see fft_kde.py)
 z_range = np.linspace(z_f.min(), z_f.max(), 1000).reshape(-1, 1)
-p_h = np.exp(kde.score_samples(z_range))
+p_h = kde_fft(z_f, z_range, bandwidth=1.0)
 
 plt.figure(figsize=(8,5))
 plt.plot(z_range, p_h)
@@ -115,4 +117,25 @@ plt.show()
 
 print("r =", r)
 print("a_r =", a_r)
-print("b_r =", b_r)
\ No newline at end of file
+print("b_r =", b_r)
+
+# Seeds trained together as one batched ensemble, to see the spread of the
+# learned PDF across initializations (0 to skip)
+n_seeds = 0
+
+if n_seeds:
+    samples, history = train_gan_ensemble(z_tensor, range(n_seeds), epochs, batch_size)
+    samples = scaler.inverse_transform(samples.reshape(-1, 1)).reshape(n_seeds, -1, 1)
+
+    plt.figure(figsize=(8,5))
+    for seed, z_s in enumerate(samples):
+        plt.plot(z_range, kde_fft(z_s, z_range, bandwidth=1.0), alpha=0.7, label=f"seed {seed}")
+    plt.xlabel("z")
+    plt.ylabel("p̂_h(z)")
+    plt.title(f"PDF Approximation from {n_seeds} GAN Seeds")
+    plt.legend()
+    plt.show()
+
+    for seed in range(n_seeds):
+        print(f"seed {seed}: loss_D = {history['loss_D'][seed, -1]:.4f}, "
+              f"loss_G = {history['loss_G'][seed, -1]:.4f}")
\ No newline at end of file
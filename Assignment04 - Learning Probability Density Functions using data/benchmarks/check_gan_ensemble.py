@@ -0,0 +1,185 @@
+"""Check the batched GAN ensemble against independent runs, and time it.
+
+Run from the ``Assignment04`` directory:
+
+    python benchmarks/check_gan_ensemble.py
+    python benchmarks/check_gan_ensemble.py --seeds 16 --epochs 2500
+
+Correctness: each member of a ``GANEnsemble`` is copied into a plain
+``nn.Linear`` generator/discriminator pair (``gan_ensemble.member``) with
+its own ``nn.BCELoss`` and Adam optimizers, exactly as in assignment_4.py.
+Both are trained for ``--check-steps`` steps on the same real batches and
+noise; the per-seed losses of every step and the final parameters must
+agree within ``--rtol``/``--atol`` (float32 results of batched and
+unbatched matrix multiplies can differ in the last bits).
+
+Speed: ``--seeds`` sequential runs of the assignment_4.py training loop
+against one ``train_gan_ensemble`` call with the same number of epochs,
+on synthetic standardized data. Exits with status 1 if the check fails.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gan_ensemble import GANEnsemble, member, train_gan_ensemble  # noqa: E402
+
+
+def make_data(rows=10000, seed=0):
+    # Skewed, standardized stand-in for the scaled z values
+    rng = np.random.default_rng(seed)
+    z = rng.gamma(2.0, 1.0, (rows, 1))
+    return torch.tensor((z - z.mean()) / z.std(), dtype=torch.float32)
+
+
+def check(data, n_seeds, steps, batch_size, rtol, atol):
+    ensemble = GANEnsemble(range(n_seeds))
+    pairs = [(member(ensemble.G, i), member(ensemble.D, i)) for i in range(n_seeds)]
+    optimizers = [(optim.Adam(G.parameters(), lr=0.001), optim.Adam(D.parameters(), lr=0.001))
+                  for G, D in pairs]
+    criterion = nn.BCELoss()
+    real_labels = torch.ones(batch_size, 1)
+    fake_labels = torch.zeros(batch_size, 1)
+
+    rng = torch.Generator().manual_seed(0)
+    worst = 0.0
+    for _ in range(steps):
+        idx = torch.randint(0, data.size(0), (n_seeds, batch_size), generator=rng)
+        noise_D = torch.randn(n_seeds, batch_size, 1, generator=rng)
+        noise_G = torch.randn(n_seeds, batch_size, 1, generator=rng)
+        loss_D, loss_G = ensemble.step(data[idx], noise_D, noise_G)
+
+        for i, ((G, D), (optimizer_G, optimizer_D)) in enumerate(zip(pairs, optimizers)):
+            # The training step of assignment_4.py
+            fake_samples = G(noise_D[i])
+            ref_D = criterion(D(data[idx[i]]), real_labels) + criterion(D(fake_samples.detach()), fake_labels)
+            optimizer_D.zero_grad()
+            ref_D.backward()
+            optimizer_D.step()
+
+            ref_G = criterion(D(G(noise_G[i])), real_labels)
+            optimizer_G.zero_grad()
+            ref_G.backward()
+            optimizer_G.step()
+
+            for got, ref in ((loss_D[i], ref_D), (loss_G[i], ref_G)):
+                if not torch.isclose(got, ref.detach(), rtol=rtol, atol=atol):
+                    return False, f"seed {i}: loss {got.item():.8g} != {ref.item():.8g}"
+                worst = max(worst, abs(got.item() - ref.item()))
+
+    for i, (G, D) in enumerate(pairs):
+        for got, ref in ((member(ensemble.G, i), G), (member(ensemble.D, i), D)):
+            for a, b in zip(got.parameters(), ref.parameters()):
+                if not torch.allclose(a, b, rtol=rtol, atol=atol):
+                    return False, f"seed {i}: parameters differ by {(a - b).abs().max().item():.3g}"
+                worst = max(worst, (a - b).abs().max().item())
+    return True, f"largest difference {worst:.3g}"
+
+
+class Generator(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.model = nn.Sequential(
+            nn.Linear(1, 16),
+            nn.ReLU(),
+            nn.Linear(16, 16),
+            nn.ReLU(),
+            nn.Linear(16, 1)
+        )
+
+    def forward(self, x):
+        return self.model(x)
+
+
+class Discriminator(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.model = nn.Sequential(
+            nn.Linear(1, 16),
+            nn.LeakyReLU(0.2),
+            nn.Linear(16, 16),
+            nn.LeakyReLU(0.2),
+            nn.Linear(16, 1),
+            nn.Sigmoid()
+        )
+
+    def forward(self, x):
+        return self.model(x)
+
+
+def sequential_run(data, seed, epochs, batch_size):
+    # assignment_4.py's training loop and final sampling, for one seed
+    torch.manual_seed(seed)
+    np.random.seed(seed)
+    G = Generator()
+    D = Discriminator()
+    criterion = nn.BCELoss()
+    optimizer_G = optim.Adam(G.parameters(), lr=0.001)
+    optimizer_D = optim.Adam(D.parameters(), lr=0.001)
+
+    for _ in range(epochs):
+        idx = np.random.randint(0, data.size(0), batch_size)
+        real_samples = data[idx]
+
+        real_labels = torch.ones(batch_size, 1)
+        fake_labels = torch.zeros(batch_size, 1)
+
+        noise = torch.randn(batch_size, 1)
+        fake_samples = G(noise)
+
+        loss_D = criterion(D(real_samples), real_labels) + criterion(D(fake_samples.detach()), fake_labels)
+        optimizer_D.zero_grad()
+        loss_D.backward()
+        optimizer_D.step()
+
+        noise = torch.randn(batch_size, 1)
+        generated = G(noise)
+        loss_G = criterion(D(generated), real_labels)
+        optimizer_G.zero_grad()
+        loss_G.backward()
+        optimizer_G.step()
+
+    with torch.no_grad():
+        return G(torch.randn(10000, 1)).numpy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=8)
+    parser.add_argument("--epochs", type=int, default=2500, help="epochs of the timed runs")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--check-steps", type=int, default=25)
+    parser.add_argument("--rtol", type=float, default=1e-4)
+    parser.add_argument("--atol", type=float, default=1e-6)
+    args = parser.parse_args(argv)
+
+    data = make_data()
+    ok, detail = check(data, args.seeds, args.check_steps, args.batch_size, args.rtol, args.atol)
+    print(f"{args.seeds} ensemble members vs independent runs, {args.check_steps} steps: "
+          f"{'same losses and parameters' if ok else 'MISMATCH'} ({detail})")
+
+    start = time.perf_counter()
+    for seed in range(args.seeds):
+        sequential_run(data, seed, args.epochs, args.batch_size)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    train_gan_ensemble(data, range(args.seeds), args.epochs, args.batch_size)
+    ensemble = time.perf_counter() - start
+
+    print(f"{args.seeds} seeds x {args.epochs} epochs (torch {torch.__version__}, "
+          f"{torch.get_num_threads()} threads):")
+    print(f"  sequential runs  {sequential:8.2f}s")
+    print(f"  ensemble         {ensemble:8.2f}s  (x{sequential / ensemble:.1f})")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
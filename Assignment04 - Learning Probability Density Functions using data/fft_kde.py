@@ -0,0 +1,137 @@
+"""Binned Gaussian kernel density estimate of 1-D samples, computed with an FFT.
+
+``KernelDensity.score_samples`` sums the kernel over every (sample, point)
+pair. Here the samples are first spread over a uniform grid by linear
+binning (each sample splits its weight between the two nearest grid
+points), the binned counts are convolved with the kernel sampled on the
+same grid through an FFT, and the result is interpolated linearly at the
+requested points. The cost is O(n + bins log bins) instead of
+O(n * points).
+
+Accuracy. Linear binning and linear interpolation each replace the kernel
+by its linear interpolant between grid points, which is off by at most
+step**2 / 8 times the largest |K''| within the grid cell. Convolving the
+binned counts with |K''| maximized over a window of two grid steps gives,
+at every grid point, an upper bound on the sum of both errors, i.e. on
+the difference from ``KernelDensity(kernel="gaussian")``. By default the
+grid is refined until that bound is within ``TOLERANCE`` times the peak
+density, so the tolerance is guaranteed, not estimated. Ranges very wide
+relative to the bandwidth may need more than ``MAX_BINS`` bins; a warning
+then says the tolerance is not met.
+"""
+import math
+import warnings
+
+import numpy as np
+
+# Largest difference from KernelDensity, as a fraction of the peak density
+TOLERANCE = 1e-4
+
+# Grid of the first pass, in steps per bandwidth
+FIRST_PASS_STEPS = 4
+MIN_BINS = 2 ** 10
+
+# About 32 MB per float64 grid array; the FFT works on a few times that
+MAX_BINS = 2 ** 22
+
+# The kernel (and its second derivative) underflows to exactly 0 in float64
+# beyond this many bandwidths
+KERNEL_BANDWIDTHS = 40
+
+SQRT3 = math.sqrt(3)
+
+
+def _abs_phi2(t):
+    # |phi''(t)| of the standard normal density phi
+    return np.abs(t * t - 1) * np.exp(-0.5 * t * t) / math.sqrt(2 * math.pi)
+
+
+def _window_max_abs_phi2(t, w):
+    # Largest |phi''| over [t - w, t + w]. It is even and monotone between
+    # its critical points 0, 1 and sqrt(3), so the maximum lies at an end of
+    # the window or at one of the local maxima 0 and +-sqrt(3) inside it.
+    a, b = t - w, t + w
+    result = np.maximum(_abs_phi2(a), _abs_phi2(b))
+    for c in (0.0, SQRT3, -SQRT3):
+        inside = (a <= c) & (c <= b)
+        result[inside] = np.maximum(result[inside], _abs_phi2(c))
+    return result
+
+
+def _binned_density(samples, lo, hi, bandwidth, bins):
+    # Returns the grid step, the density on the grid and the largest
+    # difference from the exact KDE anywhere in [lo, hi]
+    n = len(samples)
+    step = (hi - lo) / (bins - 1)
+
+    # Linear binning
+    pos = (samples - lo) / step
+    left = np.minimum(pos.astype(np.int64), bins - 2)
+    frac = pos - left
+    counts = (np.bincount(left, 1 - frac, bins)
+              + np.bincount(left + 1, frac, bins))
+
+    # Kernel at grid offsets -L .. L; beyond KERNEL_BANDWIDTHS it is 0
+    L = min(bins - 1, math.ceil(KERNEL_BANDWIDTHS * bandwidth / step) + 2)
+    t = np.arange(-L, L + 1) * (step / bandwidth)
+    kernel = np.exp(-0.5 * t ** 2) / (n * bandwidth * math.sqrt(2 * math.pi))
+    # Error kernel: both errors are at most step**2 / 8 * |K''| maximized
+    # over two steps around the offset (a sample lies within one step of the
+    # grid points it is binned to, an evaluation point within one step of
+    # the grid points it is interpolated from)
+    error_kernel = (step ** 2 / 4) * _window_max_abs_phi2(t, 2 * step / bandwidth) / (
+        n * bandwidth ** 3)
+
+    # Linear convolutions; the grid values are their entries L .. L + bins - 1
+    size = 1 << (bins + 2 * L - 1).bit_length()
+    spectrum = np.fft.rfft(counts, size)
+    density = np.fft.irfft(spectrum * np.fft.rfft(kernel, size), size)[L:L + bins]
+    bound = np.fft.irfft(spectrum * np.fft.rfft(error_kernel, size), size)[L:L + bins]
+    # The bound is taken over the two grid points around any evaluation point
+    return step, np.maximum(density, 0), bound.max()
+
+
+def kde_fft(samples, points, bandwidth=1.0, bins=None, tolerance=TOLERANCE):
+    """Gaussian KDE of ``samples`` evaluated at ``points`` (densities, not logs).
+
+    With ``bins=None`` the grid is refined until the result is guaranteed to
+    be within ``tolerance`` times the peak density of ``KernelDensity``'s
+    (see the module docstring). A given ``bins`` is used as is, with a
+    warning when it cannot guarantee ``tolerance``.
+    """
+    samples = np.asarray(samples, dtype=float).ravel()
+    points = np.asarray(points, dtype=float)
+    if len(samples) == 0:
+        raise ValueError("No samples to estimate from.")
+
+    # The grid covers the samples and the points, so no kernel mass is lost
+    lo = min(samples.min(), points.min())
+    hi = max(samples.max(), points.max())
+    if hi == lo:
+        lo, hi = lo - bandwidth, hi + bandwidth
+
+    def within_tolerance(density, bound):
+        # The true peak is at least the estimated one minus the bound
+        return bound <= tolerance * (density.max() - bound)
+
+    if bins is not None:
+        step, density, bound = _binned_density(samples, lo, hi, bandwidth, bins)
+    else:
+        bins = min(MAX_BINS, max(MIN_BINS, math.ceil(FIRST_PASS_STEPS * (hi - lo) / bandwidth) + 1))
+        step, density, bound = _binned_density(samples, lo, hi, bandwidth, bins)
+        while not within_tolerance(density, bound) and bins < MAX_BINS:
+            # The bound shrinks about as step**2; aim a little below it
+            target = tolerance * density.max() / (1 + tolerance)
+            bins = min(MAX_BINS, max(bins + bins // 4, math.ceil(
+                (bins - 1) * 1.1 * math.sqrt(bound / target)) + 1))
+            step, density, bound = _binned_density(samples, lo, hi, bandwidth, bins)
+
+    if not within_tolerance(density, bound):
+        warnings.warn(
+            f"{bins} bins over a range of {(hi - lo) / bandwidth:.0f} bandwidths cannot "
+            f"guarantee a difference within {tolerance:g} of the peak density "
+            f"(bound: {bound / density.max():.2g})",
+            stacklevel=2)
+
+    grid = lo + step * np.arange(bins)
+    return np.interp(points.ravel(), grid, density).reshape(points.shape)
@@ -0,0 +1,160 @@
+"""Training many seeds of the assignment GAN in one batched pass.
+
+Each layer of the N generators (and of the N discriminators) is one
+(N, in, out) weight tensor, so a forward pass of the whole ensemble is a
+few ``torch.baddbmm`` calls instead of N sets of tiny matrix multiplies.
+The members share no parameters and their losses are summed, so each one
+gets exactly the gradient it would get on its own; Adam updates every
+element independently, so one optimizer over the stacked tensors steps
+each member as its own optimizer would. ``member`` extracts one member as
+a plain ``nn.Linear`` network, which ``benchmarks/check_gan_ensemble.py``
+uses to check this against independent runs.
+"""
+import copy
+import math
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class EnsembleLinear(nn.Module):
+    """N independent ``nn.Linear`` layers applied to an (N, batch, in) input."""
+
+    def __init__(self, n_models, in_features, out_features):
+        super().__init__()
+        self.weight = nn.Parameter(torch.empty(n_models, in_features, out_features))
+        self.bias = nn.Parameter(torch.empty(n_models, 1, out_features))
+        self.reset_parameters()
+
+    def reset_parameters(self, generators=None):
+        # Same distribution as nn.Linear, U(-1/sqrt(in), 1/sqrt(in)), drawn
+        # from each member's own generator (the global one if None)
+        if generators is None:
+            generators = [None] * self.weight.size(0)
+        bound = 1 / math.sqrt(self.weight.size(1))
+        with torch.no_grad():
+            for i, generator in enumerate(generators):
+                self.weight[i].uniform_(-bound, bound, generator=generator)
+                self.bias[i].uniform_(-bound, bound, generator=generator)
+
+    def forward(self, x):
+        return torch.baddbmm(self.bias, x, self.weight)
+
+
+class EnsembleGenerator(nn.Module):
+    def __init__(self, n_models):
+        super().__init__()
+        self.model = nn.Sequential(
+            EnsembleLinear(n_models, 1, 16),
+            nn.ReLU(),
+            EnsembleLinear(n_models, 16, 16),
+            nn.ReLU(),
+            EnsembleLinear(n_models, 16, 1)
+        )
+
+    def forward(self, x):
+        return self.model(x)
+
+
+class EnsembleDiscriminator(nn.Module):
+    def __init__(self, n_models):
+        super().__init__()
+        self.model = nn.Sequential(
+            EnsembleLinear(n_models, 1, 16),
+            nn.LeakyReLU(0.2),
+            EnsembleLinear(n_models, 16, 16),
+            nn.LeakyReLU(0.2),
+            EnsembleLinear(n_models, 16, 1),
+            nn.Sigmoid()
+        )
+
+    def forward(self, x):
+        return self.model(x)
+
+
+def member(ensemble, i):
+    """Member ``i`` of an ensemble network, as an ``nn.Sequential`` of ``nn.Linear``."""
+    layers = []
+    for layer in ensemble.model:
+        if isinstance(layer, EnsembleLinear):
+            linear = nn.Linear(layer.weight.size(1), layer.weight.size(2))
+            with torch.no_grad():
+                linear.weight.copy_(layer.weight[i].T)
+                linear.bias.copy_(layer.bias[i, 0])
+            layers.append(linear)
+        else:
+            layers.append(copy.deepcopy(layer))
+    return nn.Sequential(*layers)
+
+
+def _bce(output, target):
+    # nn.BCELoss per member: mean over its batch, one value per member
+    return F.binary_cross_entropy(output, target, reduction="none").mean(dim=(1, 2))
+
+
+class GANEnsemble:
+    """N generator/discriminator pairs, one per seed, and their optimizers."""
+
+    def __init__(self, seeds, lr=0.001):
+        self.seeds = list(seeds)
+        n = len(self.seeds)
+        self.G = EnsembleGenerator(n)
+        self.D = EnsembleDiscriminator(n)
+        # Each seed sets the initial weights of its own pair
+        generators = [torch.Generator().manual_seed(s) for s in self.seeds]
+        for layer in [*self.G.modules(), *self.D.modules()]:
+            if isinstance(layer, EnsembleLinear):
+                layer.reset_parameters(generators)
+        self.optimizer_G = torch.optim.Adam(self.G.parameters(), lr=lr)
+        self.optimizer_D = torch.optim.Adam(self.D.parameters(), lr=lr)
+
+    def step(self, real_samples, noise_D, noise_G):
+        # One training step of every member, as in assignment_4.py; all
+        # inputs are (N, batch, 1). Returns the (N,) D and G losses.
+        real_labels = torch.ones_like(real_samples)
+        fake_labels = torch.zeros_like(real_samples)
+
+        fake_samples = self.G(noise_D)
+        loss_D = _bce(self.D(real_samples), real_labels) + _bce(self.D(fake_samples.detach()), fake_labels)
+        self.optimizer_D.zero_grad()
+        loss_D.sum().backward()
+        self.optimizer_D.step()
+
+        generated = self.G(noise_G)
+        loss_G = _bce(self.D(generated), real_labels)
+        self.optimizer_G.zero_grad()
+        loss_G.sum().backward()
+        self.optimizer_G.step()
+        return loss_D.detach(), loss_G.detach()
+
+
+def train_gan_ensemble(data, seeds, epochs=2500, batch_size=64, lr=0.001, n_samples=10000,
+                       seed=0):
+    """Train one generator/discriminator pair per seed, all at once.
+
+    ``data`` is the (rows, 1) float tensor of scaled training values. Each
+    seed initializes its own pair; the batches and noise of every member
+    are drawn from one generator seeded with ``seed``, independently per
+    member. Returns ``(samples, history)``: an (N, n_samples, 1) array of
+    generated values in the scale of ``data``, and ``{"loss_D": ...,
+    "loss_G": ...}`` with one row of ``epochs`` losses per seed.
+    """
+    ensemble = GANEnsemble(seeds, lr)
+    n = len(ensemble.seeds)
+
+    rng = torch.Generator().manual_seed(seed)
+    loss_D_history = torch.empty(epochs, n)
+    loss_G_history = torch.empty(epochs, n)
+
+    for step in range(epochs):
+        idx = torch.randint(0, data.size(0), (n, batch_size), generator=rng)
+        noise_D = torch.randn(n, batch_size, 1, generator=rng)
+        noise_G = torch.randn(n, batch_size, 1, generator=rng)
+        loss_D_history[step], loss_G_history[step] = ensemble.step(data[idx], noise_D, noise_G)
+
+    with torch.no_grad():
+        samples = ensemble.G(torch.randn(n, n_samples, 1, generator=rng)).numpy()
+
+    history = {"loss_D": loss_D_history.T.numpy(), "loss_G": loss_G_history.T.numpy()}
+    return samples, history
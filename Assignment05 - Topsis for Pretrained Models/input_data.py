@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from topsis_vansh_102303806 import topsis_scenarios, topsis_scores
 
 # -----------------------------
 # Load input data
@@ -34,23 +35,10 @@ benefit_flags = np.array([True, True, True, False, False, False, True])
 # TOPSIS Steps
 # -----------------------------
 
-# Step 1: Normalize
-norm = np.sqrt((A ** 2).sum(axis=0))
-R = A / norm
-
-# Step 2: Weighted normalized matrix
-W = R * weights
-
-# Step 3: Ideal best & worst
-ideal_best = np.where(benefit_flags, W.max(axis=0), W.min(axis=0))
-ideal_worst = np.where(benefit_flags, W.min(axis=0), W.max(axis=0))
-
-# Step 4: Distances
-S_plus = np.sqrt(((W - ideal_best) ** 2).sum(axis=1))
-S_minus = np.sqrt(((W - ideal_worst) ** 2).sum(axis=1))
-
-# Step 5: TOPSIS score
-topsis_score = S_minus / (S_plus + S_minus)
+# Normalize, weight, ideal best/worst, distances and score are all
+# done by the shared array implementation in the topsis package.
+impacts = ["+" if flag else "-" for flag in benefit_flags]
+topsis_score = topsis_scores(A, weights, impacts)
 
 df["TOPSIS_Score"] = topsis_score
 df["Rank"] = df["TOPSIS_Score"].rank(ascending=False).astype(int)
@@ -63,6 +51,34 @@ df = df.sort_values("Rank")
 df.to_csv("topsis_results.csv", index=False)
 print(df[["Model", "TOPSIS_Score", "Rank"]])
 
+# -----------------------------
+# Rank stability under uncertain weights
+# -----------------------------
+# Weight vectors are drawn from a Dirichlet distribution centred on
+# `weights` (higher concentration = less spread) and scored in batches.
+N_SAMPLES = 1_000_000
+CONCENTRATION = 100
+SAMPLE_BATCH = 100_000
+
+rng = np.random.default_rng(42)
+rank_counts = np.zeros((len(models), len(models)), dtype=np.int64)
+for start in range(0, N_SAMPLES, SAMPLE_BATCH):
+    size = min(SAMPLE_BATCH, N_SAMPLES - start)
+    sampled_weights = rng.dirichlet(weights * CONCENTRATION, size=size)
+    _, sampled_ranks = topsis_scenarios(A, sampled_weights, impacts)
+    # Row i of rank_counts counts how often model i lands at each rank
+    cells = np.arange(len(models)) * len(models) + (sampled_ranks - 1)
+    rank_counts += np.bincount(cells.ravel(), minlength=rank_counts.size).reshape(rank_counts.shape)
+
+stability = pd.DataFrame(
+    rank_counts / N_SAMPLES,
+    index=models,
+    columns=[f"Rank {r}" for r in range(1, len(models) + 1)],
+)
+stability.to_csv("rank_stability.csv")
+print(f"\nRank frequencies over {N_SAMPLES} sampled weight vectors:")
+print(stability.round(3))
+
 # -----------------------------
 # Plot
 # -----------------------------